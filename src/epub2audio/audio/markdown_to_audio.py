@@ -5,11 +5,13 @@ Convert a Markdown file into a single audiobook using macOS `say`.
 Pipeline:
 1. Read Markdown
 2. Generate a single narration track via `say`
-3. Transcode to the requested output format
+3. Stream it through ffmpeg into the requested output format (or transcode a
+   temporary file when streaming fails)
 """
 
 from __future__ import annotations
 
+import hashlib
 import subprocess
 import tempfile
 from pathlib import Path
@@ -35,23 +37,9 @@ _console = progress.console
 # ------------------------------
 
 def say_to_file(text: str, output: Path) -> None:
-    """Generate audio for text using macOS `say`."""
-    tmp_text_path: Path | None = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            suffix=".txt",
-            encoding="utf-8",
-            delete=False,
-        ) as tmp_text:
-            tmp_text.write(text)
-            tmp_text_path = Path(tmp_text.name)
-
-        cmd = ["say", "-o", str(output), "-f", str(tmp_text_path)]
-        subprocess.run(cmd, check=True)
-    finally:
-        if tmp_text_path is not None:
-            tmp_text_path.unlink(missing_ok=True)
+    """Generate audio for text using macOS `say`, streaming text via stdin."""
+    cmd = ["say", "-o", str(output)]
+    subprocess.run(cmd, input=text, text=True, check=True)
 
 def transcode_audio(input_path: Path, output: Path) -> None:
     """Transcode audio to the requested format using ffmpeg."""
@@ -61,6 +49,113 @@ def transcode_audio(input_path: Path, output: Path) -> None:
     cmd.append(str(output))
     subprocess.run(cmd, check=True)
 
+def _pipe_say_to_ffmpeg(text: str, output: Path) -> None:
+    """Pipe `say` WAVE output straight into ffmpeg without an intermediate file.
+
+    `say` cannot seek back to patch the RIFF sizes when writing to a pipe, so
+    ffmpeg is told to ignore the header lengths and read until EOF.
+    """
+    say_cmd = [
+        "say",
+        "-o",
+        "/dev/stdout",
+        "--file-format=WAVE",
+        "--data-format=LEI16@22050",
+    ]
+    ffmpeg_cmd = ["ffmpeg", "-y", "-f", "wav", "-ignore_length", "1", "-i", "pipe:0"]
+    if output.suffix.lower() in {".m4a", ".m4b", ".mp4"}:
+        ffmpeg_cmd.extend(["-c:a", "aac", "-b:a", "192k", "-movflags", "+faststart"])
+    ffmpeg_cmd.append(str(output))
+
+    say_proc = subprocess.Popen(say_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    ffmpeg_proc = subprocess.Popen(ffmpeg_cmd, stdin=say_proc.stdout)
+    assert say_proc.stdin is not None and say_proc.stdout is not None
+    # Let ffmpeg own the read end so `say` sees SIGPIPE if ffmpeg exits early.
+    say_proc.stdout.close()
+    try:
+        say_proc.stdin.write(text.encode("utf-8"))
+    finally:
+        say_proc.stdin.close()
+
+    say_code = say_proc.wait()
+    ffmpeg_code = ffmpeg_proc.wait()
+    if say_code != 0:
+        raise subprocess.CalledProcessError(say_code, say_cmd)
+    if ffmpeg_code != 0:
+        raise subprocess.CalledProcessError(ffmpeg_code, ffmpeg_cmd)
+
+def say_and_transcode(text: str, output: Path) -> None:
+    """Narrate text into ``output``, streaming through ffmpeg when possible.
+
+    Falls back to rendering a temporary AIFF and transcoding it when the pipe
+    fails or leaves no audio behind.
+    """
+    try:
+        _pipe_say_to_ffmpeg(text, output)
+    except subprocess.CalledProcessError as exc:
+        logger.debug(
+            "Streaming narration failed ({error}); using a temp file", error=exc
+        )
+    else:
+        if output.exists() and output.stat().st_size > 0:
+            return
+        logger.debug("Streaming narration wrote no audio; using a temp file")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_audio_path = Path(tmp) / "narration.aiff"
+        say_to_file(text, raw_audio_path)
+        transcode_audio(raw_audio_path, output)
+
+
+def _narration_digest(text: str) -> str:
+    """Return a short content hash identifying the narrated text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _digest_path(output: Path) -> Path:
+    """Return the sidecar path storing the digest of the narrated text."""
+    return output.with_suffix(output.suffix + ".hash")
+
+
+def narrate_markdown(markdown: Path, output: Path) -> bool:
+    """Narrate a Markdown file to ``output`` without any console output.
+
+    Returns ``False`` when the sidecar digest shows the narration is unchanged,
+    and raises ``ValueError`` when the file has no speakable content.
+    """
+    logger.trace("Reading markdown: {stem}...", stem=markdown.stem)
+    text = markdown.read_text(encoding="utf-8")
+    text = text.lstrip('#')
+    text = text.strip()
+    if not text:
+        raise ValueError(f"No speakable content found: {markdown}")
+
+    logger.trace("{count} lines to narrate...", count=text.count("\n") + 1)
+
+    digest = _narration_digest(text)
+    digest_path = _digest_path(output)
+    if (
+        output.exists()
+        and digest_path.exists()
+        and digest_path.read_text(encoding="utf-8") == digest
+    ):
+        logger.info("Narration unchanged; skipping: {name}", name=output.name)
+        return False
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    # Drop the old digest first so a failed or interrupted run never leaves a
+    # partial file that a later run would take as up to date.
+    digest_path.unlink(missing_ok=True)
+    if output.suffix.lower() in {".aiff", ".aif"}:
+        say_to_file(text, output)
+    else:
+        logger.info("Narrating and transcoding audio")
+        say_and_transcode(text, output)
+    digest_path.write_text(digest, encoding="utf-8")
+
+    logger.trace("Chapter narrated: {path}", path=output.resolve())
+    return True
+
 
 # ------------------------------
 # CLI
@@ -83,39 +178,19 @@ def generate(
         f"[i #999]Reading markdown:[/] [b #9f0]{markdown.stem}[/][#999]...[/]",
         spinner="point"):
 
-        logger.trace(f"Reading markdown: {markdown.stem}...")
+        _console.print(RichPanel(Markdown(markdown.read_text(encoding="utf-8"))))
 
-        text = markdown.read_text(encoding="utf-8")
-        _console.print(RichPanel(Markdown(text)))
-
-        text = text.lstrip('#')
-        text = text.strip()
-        if not text:
+        try:
+            narrated = narrate_markdown(markdown, output)
+        except ValueError:
             logger.error("No speakable content found.")
             raise typer.Exit(code=1)
+        if not narrated:
+            return
 
-        line_count = text.count("\n") + 1
-        narrate_msg = f"{line_count} lines to narrate..."
-        logger.trace(f"{narrate_msg}")
-        msg = output.stem
-
-        output.parent.mkdir(parents=True, exist_ok=True)
-        with tempfile.TemporaryDirectory() as tmp:
-            audio_tmp_file = Path(tmp)
-            raw_audio_path = audio_tmp_file / "narration.aiff"
-
-            say_to_file(text, raw_audio_path)
-
-            if output.suffix.lower() in {".aiff", ".aif"}:
-                raw_audio_path.replace(output)
-            else:
-                logger.info("Transcoding audio")
-                transcode_audio(raw_audio_path, output)
-
-        logger.trace(f"Chapter narrated: {output.resolve()}")
         progress.console.print(
             Panel(
-                f"Narrated {msg}!",
+                f"Narrated {output.stem}!",
                 title="Success!",
                 colors=['#9f0','#0f0', '#0f9'],
                 title_style="b #fff"
@@ -3,14 +3,17 @@
 
 from __future__ import annotations
 
-import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
+import orjson
 import typer
 
 from epub2audio.audio import markdown_to_audio
 from epub2audio.utils.logging import get_logger, get_progress
+from epub2audio.utils.toc import numeric_chapters
 
 app = typer.Typer(add_completion=False)
 logger = get_logger()
@@ -20,7 +23,7 @@ progress = get_progress()
 def _load_toc(toc_path: Path) -> list[dict[str, Any]]:
     if not toc_path.exists():
         raise FileNotFoundError(f"toc.json not found: {toc_path}")
-    return json.loads(toc_path.read_text(encoding="utf-8"))
+    return orjson.loads(toc_path.read_bytes())
 
 
 def _audio_path_from_entry(
@@ -42,6 +45,36 @@ def _audio_path_from_entry(
     return book_dir / "audio" / audio_name
 
 
+def narrate_entry(
+    entry: dict[str, Any],
+    book_dir: Path,
+    *,
+    overwrite: bool,
+    skip_existing: bool,
+) -> Path | None:
+    """Narrate a single toc.json entry; returns the audio path if written."""
+    md_path_value = entry.get("markdown")
+    if not md_path_value:
+        return None
+    md_path = Path(md_path_value)
+    if not md_path.exists():
+        logger.warning("Markdown missing: {path}", path=md_path)
+        return None
+
+    output_path = _audio_path_from_entry(entry, book_dir=book_dir)
+    if not output_path:
+        return None
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if output_path.exists() and skip_existing and not overwrite:
+        logger.debug("Audio exists; skipping: {path}", path=output_path)
+        return None
+
+    if not markdown_to_audio.narrate_markdown(md_path, output_path):
+        return None
+    return output_path
+
+
 @app.command()
 def narrate_chapters(
     stem: str,
@@ -51,23 +84,18 @@ def narrate_chapters(
     skip_existing: bool = True,
     start: int | None = None,
     end: int | None = None,
+    jobs: int = os.cpu_count() or 1,
 ) -> list[Path]:
-    """Convert markdown chapters listed in toc.json into audio files."""
+    """Convert markdown chapters listed in toc.json into audio files.
+
+    Chapters are narrated concurrently across ``jobs`` worker processes.
+    """
     book_dir = base_dir / stem
     toc_path = book_dir / "json" / "toc.json"
     toc_entries = _load_toc(toc_path)
 
     if start is None or end is None:
-        markdown_chapters = [
-            entry.get("chapter_number")
-            for entry in toc_entries
-            if entry.get("markdown") and entry.get("chapter_number") is not None
-        ]
-        markdown_chapters = [
-            int(value)
-            for value in markdown_chapters
-            if isinstance(value, int) or (isinstance(value, str) and value.isdigit())
-        ]
+        markdown_chapters = numeric_chapters(toc_entries)
         if markdown_chapters:
             if start is None:
                 start = min(markdown_chapters)
@@ -102,45 +130,29 @@ def narrate_chapters(
         end = max(chapters)
     assert start in chapters, f"Start chapter not valid: {start}"
     assert end in chapters, f"End chapter not valid: {end}"
-    total_chapters = end - start + 1
+    in_range = sorted(key for key in chapters if start <= key <= end)
 
     written: list[Path] = []
     with progress:
         task = progress.add_task(
-            f"Narrating Chapter {start} to Chapter {end}...", total=total_chapters
+            f"Narrating Chapter {start} to Chapter {end}...", total=len(in_range)
         )
-        for chapter_label in sorted(chapters):
-            entry = chapters[chapter_label]
-            if start is not None and chapter_label < start:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(
+                    narrate_entry,
+                    chapters[chapter_label],
+                    book_dir,
+                    overwrite=overwrite,
+                    skip_existing=skip_existing,
+                )
+                for chapter_label in in_range
+            ]
+            for future in as_completed(futures):
+                output_path = future.result()
+                if output_path is not None:
+                    written.append(output_path)
                 progress.advance(task)
-                continue
-            if end is not None and chapter_label > end:
-                progress.advance(task)
-                continue
-            md_path_value = entry.get("markdown")
-            if not md_path_value:
-                progress.advance(task)
-                continue
-            md_path = Path(md_path_value)
-            if not md_path.exists():
-                logger.warning("Markdown missing: {path}", path=md_path)
-                progress.advance(task)
-                continue
-
-            output_path = _audio_path_from_entry(entry, book_dir=book_dir)
-            if not output_path:
-                progress.advance(task)
-                continue
-
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            if output_path.exists() and skip_existing and not overwrite:
-                logger.debug("Audio exists; skipping: {path}", path=output_path)
-                progress.advance(task)
-                continue
-
-            markdown_to_audio.generate(markdown=md_path, output=output_path)
-            written.append(output_path)
-            progress.advance(task)
 
     logger.info("Generated {count} audio files", count=len(written))
     return written
@@ -3,24 +3,101 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any
 
 import typer
 
-from epub2audio.audio.narrate_chapters import narrate_chapters
+from epub2audio.audio.narrate_chapters import narrate_entry
 from epub2audio.reformat.convert_html import convert_to_html
 from epub2audio.reformat.convert_markdown import convert_to_markdown
 from epub2audio.reformat.create_audiobook import _build_audiobook
 from epub2audio.reformat.extract import generate_toc
 from epub2audio.reformat.reformat import reformat_epub, unzip_epub_zip
 from epub2audio.utils.logging import get_logger, get_progress
+from epub2audio.utils.toc import chapter_key
 
 app = typer.Typer(add_completion=False)
 logger = get_logger()
 progress = get_progress()
 
 
+async def _convert_chapters(
+    stem: str,
+    *,
+    base_dir: Path,
+    toc_entries: list[dict[str, Any]],
+    narrate_start: int | None,
+    narrate_end: int | None,
+    skip_existing: bool,
+    overwrite: bool,
+    jobs: int,
+) -> list[Path]:
+    """Copy HTML, convert Markdown, and narrate chapters as overlapping stages.
+
+    HTML copying runs alongside Markdown conversion, and each chapter is queued
+    for narration as soon as its Markdown is written, so `say`/ffmpeg work
+    starts while pandoc is still converting later chapters.
+    """
+    loop = asyncio.get_running_loop()
+    book_dir = base_dir / stem
+    queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+
+    def enqueue(entry: dict[str, Any]) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, entry)
+
+    async def convert() -> None:
+        try:
+            await asyncio.gather(
+                asyncio.to_thread(
+                    convert_to_html, stem, base_dir=base_dir, toc_entries=toc_entries
+                ),
+                asyncio.to_thread(
+                    convert_to_markdown,
+                    stem,
+                    base_dir=base_dir,
+                    toc_entries=toc_entries,
+                    on_chapter=enqueue,
+                ),
+            )
+        finally:
+            for _ in range(jobs):
+                enqueue(None)
+
+    written: list[Path] = []
+
+    async def narrate(executor: ProcessPoolExecutor) -> None:
+        while (entry := await queue.get()) is not None:
+            chapter = chapter_key(entry)
+            if chapter is None:
+                continue
+            if narrate_start is not None and chapter < narrate_start:
+                continue
+            if narrate_end is not None and chapter > narrate_end:
+                continue
+            output_path = await loop.run_in_executor(
+                executor,
+                functools.partial(
+                    narrate_entry,
+                    dict(entry),
+                    book_dir,
+                    overwrite=overwrite,
+                    skip_existing=skip_existing,
+                ),
+            )
+            if output_path is not None:
+                written.append(output_path)
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        await asyncio.gather(convert(), *(narrate(executor) for _ in range(jobs)))
+    logger.info("Generated {count} audio files", count=len(written))
+    return written
+
+
 @app.command()
 def convert(
     epub: Path = typer.Argument(..., exists=True, dir_okay=False, readable=True),
@@ -43,6 +120,9 @@ def convert(
     narrate_overwrite: bool = typer.Option(
         True, help="Overwrite existing audio when narrating."
     ),
+    narrate_jobs: int = typer.Option(
+        os.cpu_count() or 1, help="Number of chapters to narrate in parallel."
+    ),
     output: Path | None = typer.Option(
         None, help="Output .m4b path (defaults to static/<stem>/audio/<title>.m4b)."
     ),
@@ -52,7 +132,7 @@ def convert(
         raise typer.BadParameter("Input must be an .epub file.")
 
     with progress:
-        task = progress.add_task("Preparing EPUB...", total=7)
+        task = progress.add_task("Preparing EPUB...", total=5)
         zip_path = reformat_epub(
             epub,
             base_dir=base_dir,
@@ -67,43 +147,20 @@ def convert(
             overwrite=unzip_overwrite,
         )
         progress.update(task, advance=1, description="Generating TOC...")
-        generate_toc(extracted_root)
-
-        progress.update(task, advance=1, description="Copying HTML chapters...")
-        convert_to_html(stem, base_dir=base_dir)
-
-        progress.update(task, advance=1, description="Converting to Markdown...")
-        convert_to_markdown(stem, base_dir=base_dir)
-        
-        progress.update(task, advance=1, description="Narrating chapters...")
-
-        toc_path = base_dir / stem / "json" / "toc.json"
-        if toc_path.exists():
-            toc_entries = json.loads(toc_path.read_text(encoding="utf-8"))
-            markdown_chapters = [
-                entry.get("chapter_number")
-                for entry in toc_entries
-                if entry.get("markdown") and entry.get("chapter_number") is not None
-            ]
-            markdown_chapters = [
-                int(value)
-                for value in markdown_chapters
-                if isinstance(value, int)
-                or (isinstance(value, str) and value.isdigit())
-            ]
-            if markdown_chapters:
-                if narrate_start is None:
-                    narrate_start = min(markdown_chapters)
-                if narrate_end is None:
-                    narrate_end = max(markdown_chapters)
-
-        narrate_chapters(
-            stem,
-            base_dir=base_dir,
-            start=narrate_start,
-            end=narrate_end,
-            skip_existing=narrate_skip_existing,
-            overwrite=narrate_overwrite,
+        toc_entries = generate_toc(extracted_root)
+
+        progress.update(task, advance=1, description="Converting and narrating chapters...")
+        asyncio.run(
+            _convert_chapters(
+                stem,
+                base_dir=base_dir,
+                toc_entries=toc_entries,
+                narrate_start=narrate_start,
+                narrate_end=narrate_end,
+                skip_existing=narrate_skip_existing,
+                overwrite=narrate_overwrite,
+                jobs=narrate_jobs,
+            )
         )
         progress.update(task, advance=1, description="Building audiobook...")
 
@@ -111,6 +168,7 @@ def convert(
             stem=stem,
             base_dir=base_dir,
             output=output,
+            toc_entries=toc_entries,
         )
         progress.update(task, advance=1, description="Done.")
 
@@ -1,9 +1,29 @@
 """Format epub ebooks into zip archives."""
 
+import os
 from pathlib import Path
 from shutil import copy2
 from slugify import slugify
 
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hardlink src to dst, falling back to a full copy.
+    EPUBs are treated as immutable inputs, so sharing an inode is safe; edits
+    made to the source after linking will show up in the link as well.
+    Args:
+        src(Path): The file to link or copy.
+        dst(Path): The destination path, replaced if it already exists.
+    """
+    if dst.exists():
+        if os.path.samefile(src, dst):
+            return
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        copy2(src=src, dst=dst)
+
+
 def change_ext(
     epub: str,
     copy_epub: bool = True,
@@ -31,11 +51,11 @@ def change_ext(
     if copy_epub:
         if not epub_dir.exists():
             epub_dir.mkdir(parents=True, exist_ok=True)
-        copy2(src=epub_path, dst=epub_dir / f'{epub_stem}.epub')
+        _link_or_copy(epub_path, epub_dir / f'{epub_stem}.epub')
 
     if not zip_dir.exists():
         zip_dir.mkdir(parents=True, exist_ok=True)
 
     zip_path: Path = zip_dir / f'{epub_stem}.zip'
-    copy2(src=epub_path, dst=zip_path)
+    _link_or_copy(epub_path, zip_path)
     return str(zip_path)
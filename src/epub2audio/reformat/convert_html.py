@@ -2,19 +2,26 @@
 
 from __future__ import annotations
 
-import json
+import functools
+import hashlib
+import html
+import os
 import re
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 # import shutil
 from pathlib import Path
-from typing import Any
-from xml.etree import ElementTree as ET
+from types import MappingProxyType
+from typing import Any, Mapping
+
+import orjson
 
 from epub2audio.utils.logging import get_logger, get_progress
+from epub2audio.utils.toc import write_toc
 
 logger = get_logger()
 progress = get_progress()
-RULE_SVG = """<?xml version="1.0" encoding="UTF-8"?>
+RULE_SVG = b"""<?xml version="1.0" encoding="UTF-8"?>
 <svg id="Layer_1" data-name="Layer 1" xmlns="http://www.w3.org/2000/svg" \
 xmlns:xlink="http://www.w3.org/1999/xlink" viewBox="0 0 1943.76 432.28">
   <defs>
@@ -49,44 +56,64 @@ y2="222.42" gradientUnits="userSpaceOnUse">
 </svg>
 """
 
+_CSS_RULE_RE = re.compile(r"([^{}]+)\{([^}]*)\}")
+_CSS_CLASS_RE = re.compile(r"\.([A-Za-z0-9_-]+)")
+_CSS_DECL_RE = re.compile(
+    r"(font-size|font-weight|font-style|text-align|text-transform)\s*:\s*([^;]+)",
+    re.IGNORECASE,
+)
+_RULE_IMAGE_SRC = b"image_rsrc6C6.jpg"
+_RULE_IMAGE_REPLACEMENT = b"rule.svg"
+_CHAPTER_REWRITE_RE = re.compile(
+    rb"(?P<title>(?P<open>(?i:<title>))(?s:.*?)(?P<close>(?i:</title>)))"
+    rb'|(?P<img>src="' + re.escape(_RULE_IMAGE_SRC) + rb'")'
+    rb'|(?P<cls>class="(?P<classes>[^"]+)")'
+)
+_HEAD_RE = re.compile(rb"<head\b[^>]*>(.*?)</head\s*>", re.IGNORECASE | re.DOTALL)
+_LINK_TAG_RE = re.compile(r"<link\b([^>]*)>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([A-Za-z_:][-A-Za-z0-9_:.]*)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+
 
 def _resolve_chapter_path(
     entry: dict[str, Any],
-    extracted_root: Path,
+    extracted_abs: Path,
 ) -> Path:
-    """Resolve chapter path from a TOC entry to an absolute filesystem path."""
-    chapter_path = Path(entry.get("chapter_path", ""))
-    if not chapter_path.is_absolute():
-        chapter_path = Path.cwd() / extracted_root / chapter_path
-    return chapter_path
+    """Resolve chapter path from a TOC entry to an absolute filesystem path.
+
+    ``extracted_abs`` must already be absolute; joining onto it leaves absolute
+    chapter paths untouched, so no per-entry ``Path.cwd()`` lookup is needed.
+    """
+    return extracted_abs / entry.get("chapter_path", "")
 
 
 def _parse_css_rules(css_text: str) -> dict[str, str]:
     """Parse class selectors and their declarations from CSS text."""
     rules: dict[str, str] = {}
-    for match in re.finditer(r"([^{}]+)\{([^}]*)\}", css_text):
+    for match in _CSS_RULE_RE.finditer(css_text):
         selector_group = match.group(1)
         declarations = " ".join(match.group(2).split())
         for selector in selector_group.split(","):
-            for class_match in re.finditer(r"\.([A-Za-z0-9_-]+)", selector):
-                class_name = class_match.group(1)
+            for class_name in _CSS_CLASS_RE.findall(selector):
                 rules[class_name] = declarations
     return rules
 
 
-def _parse_css_value(declarations: str, prop: str) -> str | None:
-    pattern = re.compile(rf"{re.escape(prop)}\s*:\s*([^;]+)", re.IGNORECASE)
-    found = pattern.search(declarations)
-    return found.group(1).strip() if found else None
+def _parse_css_values(declarations: str) -> dict[str, str]:
+    """Return the naming-relevant properties of a declaration block in one scan."""
+    values: dict[str, str] = {}
+    for match in _CSS_DECL_RE.finditer(declarations):
+        values.setdefault(match.group(1).lower(), match.group(2).strip())
+    return values
 
 
 def _class_name_from_declarations(declarations: str) -> str:
     """Generate a human-readable class name from a CSS declaration block."""
-    font_size = _parse_css_value(declarations, "font-size")
-    font_weight = _parse_css_value(declarations, "font-weight")
-    font_style = _parse_css_value(declarations, "font-style")
-    text_align = _parse_css_value(declarations, "text-align")
-    text_transform = _parse_css_value(declarations, "text-transform")
+    values = _parse_css_values(declarations)
+    font_size = values.get("font-size")
+    font_weight = values.get("font-weight")
+    font_style = values.get("font-style")
+    text_align = values.get("text-align")
+    text_transform = values.get("text-transform")
 
     name_parts: list[str] = []
     if font_size:
@@ -115,12 +142,46 @@ def _class_name_from_declarations(declarations: str) -> str:
     return "-".join([base] + name_parts) if name_parts else base
 
 
-def _build_class_mapping(css_paths: list[Path]) -> dict[str, str]:
-    """Build a mapping of original class names to generated human-readable names."""
+@functools.lru_cache(maxsize=None)
+def _parse_css_file(path_str: str, content_digest: str) -> Mapping[str, str]:
+    """Parse a CSS file once per (path, content) and return a read-only mapping."""
+    css_text = Path(path_str).read_text(encoding="utf-8")
+    return MappingProxyType(_parse_css_rules(css_text))
+
+
+def _build_class_mapping(
+    css_paths: list[Path],
+    cache_path: Path | None = None,
+) -> dict[str, str]:
+    """Build a mapping of original class names to generated human-readable names.
+
+    Args:
+        css_paths: Stylesheets to parse, in precedence order.
+        cache_path: Optional JSON file used to persist the mapping between runs.
+            The cache is reused only when every stylesheet path and content
+            hash match, so re-extracting an unchanged EPUB still hits it.
+    Returns:
+        Mapping of original class name to generated class name.
+    """
+    stamps = [
+        (str(path), hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest())
+        for path in css_paths
+    ]
+    fingerprint = hashlib.blake2b(
+        orjson.dumps(sorted(stamps)), digest_size=16
+    ).hexdigest()
+    if cache_path is not None and cache_path.exists():
+        try:
+            cached = orjson.loads(cache_path.read_bytes())
+        except orjson.JSONDecodeError:
+            cached = {}
+        if cached.get("fingerprint") == fingerprint:
+            logger.trace("Using cached class mapping: {path}", path=cache_path)
+            return dict(cached.get("mapping", {}))
+
     class_to_decls: dict[str, str] = {}
-    for css_path in css_paths:
-        css_text = css_path.read_text(encoding="utf-8")
-        class_to_decls.update(_parse_css_rules(css_text))
+    for path_str, content_digest in stamps:
+        class_to_decls.update(_parse_css_file(path_str, content_digest))
 
     mapping: dict[str, str] = {}
     used: dict[str, int] = {}
@@ -129,106 +190,202 @@ def _build_class_mapping(css_paths: list[Path]) -> dict[str, str]:
         count = used.get(generated, 0) + 1
         used[generated] = count
         mapping[class_name] = f"{generated}-{count}" if count > 1 else generated
-    return mapping
-
 
-def _replace_classes_in_html(html_text: str, mapping: dict[str, str]) -> str:
-    """Replace class names in HTML text using a mapping."""
-
-    def replace_match(match: re.Match[str]) -> str:
-        classes = match.group(1).split()
-        new_classes = [mapping.get(cls, cls) for cls in classes]
-        return f'class="{" ".join(new_classes)}"'
-
-    return re.sub(r'class="([^"]+)"', replace_match, html_text)
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(
+            orjson.dumps(
+                {"fingerprint": fingerprint, "mapping": mapping},
+                option=orjson.OPT_INDENT_2,
+            )
+        )
+    return mapping
 
 
 def _replace_classes_in_css(css_text: str, mapping: dict[str, str]) -> str:
     """Replace class selectors in CSS text using a mapping."""
     if not mapping:
         return css_text
-    pattern = re.compile(r"\.([A-Za-z0-9_-]+)")
 
     def repl(match: re.Match[str]) -> str:
         class_name = match.group(1)
         return f".{mapping.get(class_name, class_name)}"
 
-    return pattern.sub(repl, css_text)
+    return _CSS_CLASS_RE.sub(repl, css_text)
 
 
-def _get_namespace(tag: str) -> str:
-    """Return the XML namespace portion of a tag, or empty string if absent."""
-    logger.trace(f"Entered _get_namespace({tag=})...")
-    if tag.startswith("{") and "}" in tag:
-        namespace = tag.split("}")[0].strip("{")
-        logger.trace(f"{namespace=}")
-        return namespace
-    return ""
-
-
-def _extract_stylesheet_hrefs(html_text: str) -> list[str]:
+def _extract_stylesheet_hrefs(html_bytes: bytes) -> list[str]:
     """Return stylesheet hrefs from the document head.
 
+    Only the ``<head>`` section is scanned (and decoded), so large chapter
+    bodies are never parsed into a DOM just to read a handful of ``<link>`` tags.
+
     Args:
-        html_text: Raw XHTML/HTML source.
+        html_bytes: Raw UTF-8 XHTML/HTML source.
     Returns:
         List of stylesheet href values in source order.
     """
     logger.trace(
-        f"Entered _extract_stylesheet_hrefs(\nhtml_text='{html_text[:50]}')..."
+        "Entered _extract_stylesheet_hrefs(\nhtml_bytes={head!r})...",
+        head=html_bytes[:50],
     )
-    try:
-        root = ET.fromstring(html_text)
-    except ET.ParseError:
-        return []
-    ns = _get_namespace(root.tag)
-
-    def q(tag: str) -> str:
-        return f"{{{ns}}}{tag}" if ns else tag
-
-    head = root.find(q("head")) or root.find(f".//{q('head')}")
+    head = _HEAD_RE.search(html_bytes)
     if head is None:
         return []
 
+    head_text = head.group(1).decode("utf-8", errors="replace")
     hrefs: list[str] = []
-    for link in head.findall(q("link")):
-        rel = link.attrib.get("rel", "").lower()
-        href = link.attrib.get("href")
+    for link in _LINK_TAG_RE.finditer(head_text):
+        attrs = {
+            match.group(1).lower(): html.unescape(
+                match.group(2) if match.group(2) is not None else match.group(3)
+            )
+            for match in _ATTR_RE.finditer(link.group(1))
+        }
+        rel = attrs.get("rel", "").lower()
+        href = attrs.get("href")
         if rel == "stylesheet" and href:
             hrefs.append(href)
-    logger.trace(
-        f"Extracted stylesheets: {' ,'.join([stylesheet for stylesheet in hrefs])}"
-    )
+    logger.trace("Extracted stylesheets: {hrefs}", hrefs=hrefs)
     return hrefs
 
 
-def _replace_title(html_text: str, title: str) -> str:
-    """Replace the <title> tag contents with the provided title.
+def _rewrite_chapter_html(
+    html_bytes: bytes,
+    title: str,
+    mapping: dict[bytes, bytes],
+) -> bytes:
+    """Rewrite a chapter's title, rule image, and class names in a single pass.
+
+    Works on raw UTF-8 bytes so the chapter is never decoded and re-encoded.
 
     Args:
-        html_text: Raw XHTML/HTML source.
-        title: New document title text.
+        html_bytes: Raw UTF-8 XHTML/HTML source.
+        title: New document title text; only the first <title> is replaced.
+        mapping: Original-to-generated class names as bytes (may be empty).
     Returns:
-        Updated HTML string (or original if no <title> is found).
+        Updated HTML bytes.
     """
+    logger.trace("Entered _rewrite_chapter_html(title={title!r})", title=title)
     # Minimal HTML escaping to prevent malformed title text.
-    logger.trace(f"Entered _replace_title({title=})")
-    safe_title = title.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-    pattern = re.compile(r"(<title>)(.*?)(</title>)", re.IGNORECASE | re.DOTALL)
-    if pattern.search(html_text):
-        return pattern.sub(rf"\1{safe_title}\3", html_text, count=1)
-    return html_text
+    safe_title = (
+        title.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    ).encode("utf-8")
+    title_replaced = False
+
+    def dispatch(match: re.Match[bytes]) -> bytes:
+        nonlocal title_replaced
+        kind = match.lastgroup
+        if kind == "title":
+            if title_replaced:
+                return match.group(0)
+            title_replaced = True
+            return match.group("open") + safe_title + match.group("close")
+        if kind == "img":
+            return b'src="' + _RULE_IMAGE_REPLACEMENT + b'"'
+        classes = match.group("classes").split()
+        new_classes = [mapping.get(cls, cls) for cls in classes]
+        return b'class="' + b" ".join(new_classes) + b'"'
+
+    return _CHAPTER_REWRITE_RE.sub(dispatch, html_bytes)
+
+
+def _chapter_digest(html_bytes: bytes, title: str, mapping_fingerprint: str) -> str:
+    """Return a short hash of the inputs a rewritten chapter depends on."""
+    digest = hashlib.blake2b(html_bytes, digest_size=16)
+    digest.update(f"\0{title}\0{mapping_fingerprint}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _digest_path(output_path: Path) -> Path:
+    """Return the sidecar path storing the digest of a rewritten chapter."""
+    return output_path.with_suffix(output_path.suffix + ".hash")
+
+
+def _is_up_to_date(output_path: Path, digest: str) -> bool:
+    """Return True when output_path was written from the inputs behind digest.
 
+    Keyed on content rather than mtimes, because the default unzip mode
+    re-extracts every source file with a fresh timestamp.
+    """
+    try:
+        stored_digest = _digest_path(output_path).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return False
+    return stored_digest == digest and output_path.exists()
+
+
+def _copy_chapter(
+    chapter_path: Path,
+    output_path: Path,
+    chapter_title: str,
+    class_mapping: dict[bytes, bytes],
+    mapping_fingerprint: str,
+) -> list[Path]:
+    """Rewrite a single chapter into the html directory.
 
-def _replace_image_src(html_text: str, original: str, replacement: str) -> str:
-    """Replace an image src value with a new value."""
-    logger.trace(f"Entered _replace_image_src({original=}, {replacement=})")
-    return html_text.replace(f'src="{original}"', f'src="{replacement}"')
+    The chapter is left alone when its sidecar digest shows the source,
+    title, and class mapping are unchanged since it was last written.
+
+    Args:
+        chapter_path: Source XHTML chapter inside the extracted EPUB.
+        output_path: Destination path under the html directory.
+        chapter_title: Title to write into the chapter's <title> tag.
+        class_mapping: Original-to-generated class names, encoded as bytes.
+        mapping_fingerprint: Hash of class_mapping, folded into the digest.
+    Returns:
+        Resolved paths of the local stylesheets linked from the chapter.
+    """
+    html_bytes = chapter_path.read_bytes()
+    digest = _chapter_digest(html_bytes, chapter_title, mapping_fingerprint)
+    if _is_up_to_date(output_path, digest):
+        logger.trace("HTML up to date; skipping: {path}", path=output_path)
+    else:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        digest_path = _digest_path(output_path)
+        # Drop the old digest first so an interrupted write is never skipped.
+        digest_path.unlink(missing_ok=True)
+        # Update title while preserving the rest of the markup and links.
+        updated_bytes = _rewrite_chapter_html(html_bytes, chapter_title, class_mapping)
+        output_path.write_bytes(updated_bytes)
+        digest_path.write_text(digest, encoding="utf-8")
+
+    stylesheets: list[Path] = []
+    for href in _extract_stylesheet_hrefs(html_bytes):
+        if href.startswith(("http://", "https://", "data:", "mailto:")):
+            continue
+        stylesheets.append((chapter_path.parent / href).resolve())
+    return stylesheets
+
+
+def _copy_stylesheet(
+    src_css: Path,
+    extracted_root: Path,
+    html_root: Path,
+    class_mapping: dict[str, str],
+) -> None:
+    """Copy a linked stylesheet into the html directory, remapping class names."""
+    if not src_css.exists():
+        logger.warning("Stylesheet missing: {path}", path=src_css)
+        return
+    try:
+        css_rel = src_css.relative_to(extracted_root)
+    except ValueError:
+        css_rel = Path(src_css.name)
+    dst_css = html_root / css_rel
+    dst_css.parent.mkdir(parents=True, exist_ok=True)
+    if not dst_css.exists():
+        css_text = src_css.read_text(encoding="utf-8")
+        if class_mapping:
+            css_text = _replace_classes_in_css(css_text, class_mapping)
+        dst_css.write_text(css_text, encoding="utf-8")
 
 
 def convert_to_html(
     stem: str,
     base_dir: Path = Path("static"),
+    *,
+    toc_entries: list[dict[str, Any]] | None = None,
 ) -> list[Path]:
     """Copy chapters listed in toc.json into static/{stem}/html.
 
@@ -238,10 +395,16 @@ def convert_to_html(
     Args:
         stem: EPUB stem used to locate toc.json and extracted files.
         base_dir: Base directory containing per-book folders.
+        toc_entries: Already-loaded toc.json entries to update in place; read
+            from disk when omitted.
     Returns:
         List of written HTML file paths.
     """
-    logger.trace(f"Entered copy_chapter_from_toc({stem=}, {base_dir=})")
+    logger.trace(
+        "Entered copy_chapter_from_toc(stem={stem!r}, base_dir={base_dir!r})",
+        stem=stem,
+        base_dir=base_dir,
+    )
     book_dir = base_dir / stem
     toc_path = book_dir / "json" / "toc.json"
     if not toc_path.exists():
@@ -256,87 +419,76 @@ def convert_to_html(
 
     # Ensure rule.svg is present for image replacements.
     rule_svg = html_root / "rule.svg"
-    if not rule_svg.exists():
-        rule_svg.write_text(
-            RULE_SVG,
-            encoding="utf-8",
-        )
+    if not rule_svg.is_file():
+        rule_svg.write_bytes(RULE_SVG)
 
     # Load TOC entries that include chapter_path and chapter_title.
-    toc_entries: list[dict[str, Any]] = json.loads(toc_path.read_text(encoding="utf-8"))
-    written: list[Path] = []
+    if toc_entries is None:
+        toc_entries = orjson.loads(toc_path.read_bytes())
 
+    extracted_abs = extracted_root.absolute()
     css_paths = list(extracted_root.rglob("*.css"))
-    class_mapping = _build_class_mapping(css_paths)
+    class_mapping = _build_class_mapping(
+        css_paths, cache_path=book_dir / "json" / "class_mapping.json"
+    )
+    class_mapping_bytes = {
+        key.encode("utf-8"): value.encode("utf-8")
+        for key, value in class_mapping.items()
+    }
+    mapping_fingerprint = hashlib.blake2b(
+        orjson.dumps(class_mapping, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
 
+    written: list[Path] = []
+    copied_css: set[Path] = set()
     with progress:
         copy_task = progress.add_task("Converting chapters to HTML...", total=len(toc_entries))
-        for entry in toc_entries:
-            chapter_title = (
-                entry.get("chapter_title") or f"Chapter {entry.get('order')}"
-            )
-            chapter_path = _resolve_chapter_path(entry, extracted_root)
-            if not chapter_path.exists():
-                logger.warning("Chapter path missing: {path}", path=chapter_path)
-                continue
-
-            try:
-                chapter_rel = chapter_path.relative_to(extracted_root)
-            except ValueError:
-                chapter_rel = Path(chapter_path.name)
-
-            output_path = html_root / chapter_rel
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            progress.update(
-                copy_task, advance=0.2, description=f"Copying to {output_path}..."
-            )
-
-            # Update title while preserving the rest of the markup and links.
-            html_text = chapter_path.read_text(encoding="utf-8")
-            progress.update(copy_task, advance=0.2, description="Read html_text...")
-            updated_text = _replace_title(html_text, str(chapter_title))
-            progress.update(copy_task, advance=0.1, description="Replacing title...")
-            updated_text = _replace_image_src(
-                updated_text, "image_rsrc6C6.jpg", "rule.svg"
-            )
-            progress.update(copy_task, advance=0.1, description="Replacing hr image...")
-            if class_mapping:
-                updated_text = _replace_classes_in_html(updated_text, class_mapping)
-            output_path.write_text(updated_text, encoding="utf-8")
-            progress.update(
-                copy_task,
-                advance=0.2,
-                description="Writing updated \
-html to {output_path}...",
-            )
-            entry["html"] = str(output_path)
-            progress.update(copy_task, advance=0.2, description="Updating TOC...")
-            written.append(output_path)
-
-            for href in _extract_stylesheet_hrefs(html_text):
-                if href.startswith(("http://", "https://", "data:", "mailto:")):
-                    continue
-                # Copy linked stylesheet to keep relative links valid.
-                src_css = (chapter_path.parent / href).resolve()
-                if not src_css.exists():
-                    logger.warning("Stylesheet missing: {path}", path=src_css)
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures: dict[Future[list[Path]], tuple[dict[str, Any], Path]] = {}
+            for entry in toc_entries:
+                chapter_title = (
+                    entry.get("chapter_title") or f"Chapter {entry.get('order')}"
+                )
+                chapter_path = _resolve_chapter_path(entry, extracted_abs)
+                if not chapter_path.exists():
+                    logger.warning("Chapter path missing: {path}", path=chapter_path)
+                    progress.advance(copy_task)
                     continue
+
                 try:
-                    css_rel = src_css.relative_to(extracted_root)
+                    chapter_rel = chapter_path.relative_to(extracted_root)
                 except ValueError:
-                    css_rel = Path(src_css.name)
-                dst_css = html_root / css_rel
-                dst_css.parent.mkdir(parents=True, exist_ok=True)
-                if not dst_css.exists():
-                    css_text = src_css.read_text(encoding="utf-8")
-                    if class_mapping:
-                        css_text = _replace_classes_in_css(css_text, class_mapping)
-                    dst_css.write_text(css_text, encoding="utf-8")
+                    chapter_rel = Path(chapter_path.name)
+
+                output_path = html_root / chapter_rel
+                written.append(output_path)
+                future = executor.submit(
+                    _copy_chapter,
+                    chapter_path,
+                    output_path,
+                    str(chapter_title),
+                    class_mapping_bytes,
+                    mapping_fingerprint,
+                )
+                futures[future] = (entry, output_path)
+
+            # Apply TOC updates and stylesheet copies from the main thread.
+            for future in as_completed(futures):
+                entry, output_path = futures[future]
+                for src_css in future.result():
+                    if src_css in copied_css:
+                        continue
+                    copied_css.add(src_css)
+                    # Copy linked stylesheet to keep relative links valid.
+                    _copy_stylesheet(src_css, extracted_root, html_root, class_mapping)
+                entry["html"] = str(output_path)
+                progress.advance(copy_task)
 
     logger.trace(
         "Copied {count} chapters to {path}", count=len(written), path=html_root
     )
-    toc_path.write_text(json.dumps(toc_entries, indent=2), encoding="utf-8")
+    write_toc(toc_path, toc_entries)
     return written
 
 
@@ -2,16 +2,27 @@
 
 from __future__ import annotations
 
-import json
+import contextlib
+import functools
+import hashlib
+import http.client
+import os
 import re
 import shutil
+import socket
 import subprocess
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Any
-from rich.markdown import Markdown
+from typing import Any, Callable, Iterator
+
+import orjson
 
 from epub2audio.reformat.convert_html import RULE_SVG, _resolve_chapter_path
 from epub2audio.utils.logging import get_logger, get_progress
+from epub2audio.utils.toc import write_toc
 
 logger = get_logger()
 progress = get_progress()
@@ -21,54 +32,318 @@ RULE_MD_REPLACEMENT = (
     '<div style="max-width:75%;margin:auto;">\n    <img src="rule.svg">\n</div>'
 )
 
+# Page-ID spans are stripped first, since they can sit inside the chapter
+# heading block; the heading block and bold spans are then rewritten in one
+# scan (see _postprocess_markdown). Bold text stops at a paragraph break so an
+# unclosed span cannot swallow the next paragraph.
+_PAGE_SPAN_RE = re.compile(r'<span id="page_\d+"></span>')
+_POSTPROCESS_RE = re.compile(
+    r'(?P<head>(?:# .+\n\n)?<div class="class_.+>\n\n\d+\n\n# .+\n\n</div>)'
+    r'|(?P<bold><span class="[^"]+">\s*'
+    r"(?P<bold_text>(?:(?!\n\n)[\s\S])*?)\s*</span>)"
+)
+_SOFT_NL_RE = re.compile(r"(?<!\n)\n(?!\n)")
+_RULE_RE = re.compile(r"<div[\s\S]+?<img[\s\S]+?</div>")
+_RULE_SUBST = (
+    '<div style="width:75%;margin:auto;">\n\t<img src="rule.svg" alt="" />\n</div>'
+)
+_BOLD_RE = re.compile(r'(<span class="[^"]+">\s*(.+?)\s*</span>)')
+_PANDOC_SERVER_TIMEOUT = 10.0
+# Per-request limit for pandoc server; passed as --timeout too, since the
+# server's own 2 s default would cut off long chapters.
+_PANDOC_REQUEST_TIMEOUT = 60
+_PANDOC_BIN = shutil.which("pandoc")
+
+# Chapters built only from these tags convert in-process; anything else
+# (divs, spans, images, tables, ...) carries markup that pandoc passes through
+# as raw HTML for _postprocess_markdown, so it still goes to pandoc.
+_SIMPLE_TAGS = frozenset(
+    {
+        "html", "head", "title", "meta", "link", "body", "p", "br",
+        "h1", "h2", "h3", "h4", "h5", "h6", "em", "i", "strong", "b",
+    }
+)
+_TAG_NAME_RE = re.compile(rb"<\s*/?\s*([a-zA-Z][a-zA-Z0-9]*)")
+_INLINE_MARKERS = {"em": "*", "i": "*", "strong": "**", "b": "**"}
+_MARKDOWN_ESCAPES = str.maketrans({c: f"\\{c}" for c in "\\*_`[]<>"})
+# Text that would open a heading or list at the start of a block, escaped the
+# way pandoc's gfm writer does (``*`` and ``>`` are already escaped above).
+_BLOCK_START_RE = re.compile(r"#|[+-](?=\s|$)|\d{1,9}(?=[.)](?:\s|$))")
+
+
+def _free_port() -> int:
+    """Return a TCP port on localhost that is currently unused."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def _pandoc_server() -> Iterator[str | None]:
+    """Run one ``pandoc server`` for the duration of a conversion.
+
+    Yields:
+        The server URL, or None when pandoc has no ``server`` command (older
+        than 2.18) or it fails to come up; callers then fall back to the CLI.
+    """
+    if _PANDOC_BIN is None:
+        raise FileNotFoundError("pandoc is required but was not found on PATH")
+    port = _free_port()
+    proc = subprocess.Popen(
+        [
+            _PANDOC_BIN,
+            "server",
+            "--port",
+            str(port),
+            "--timeout",
+            str(_PANDOC_REQUEST_TIMEOUT),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + _PANDOC_SERVER_TIMEOUT
+        while proc.poll() is None and time.monotonic() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                    break
+            except OSError:
+                time.sleep(0.05)
+        else:
+            logger.debug("pandoc server unavailable; using pandoc CLI per chapter")
+            yield None
+            return
+        yield f"http://127.0.0.1:{port}/"
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def _pandoc_server_convert(html_bytes: bytes, server_url: str) -> str | None:
+    """Convert HTML to markdown with a running ``pandoc server``.
+
+    Returns None when the server answers without an ``output`` field.
+    """
+    html_text = html_bytes.decode("utf-8")
+    payload = orjson.dumps({"text": html_text, "from": "html", "to": "gfm"})
+    request = urllib.request.Request(
+        server_url,
+        data=payload,
+        headers={"Content-Type": "application/json", "Accept": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=_PANDOC_REQUEST_TIMEOUT) as response:
+        result = orjson.loads(response.read())
+    if "output" not in result:
+        logger.debug(
+            "pandoc server returned no output ({result}); using CLI", result=result
+        )
+        return None
+    return result["output"]
+
+
+def _pandoc_html_to_markdown(
+    html_bytes: bytes, cache_dir: Path, server_url: str | None = None
+) -> str:
+    """Convert HTML to markdown using pandoc.
+
+    Results are cached under ``cache_dir`` by a SHA-256 of the HTML, so
+    unchanged chapters skip pandoc on re-runs; a cache hit refreshes the
+    entry's mtime so _prune_pandoc_cache keeps it. Uses ``pandoc server`` at
+    ``server_url`` when given, and spawns the pandoc CLI otherwise or if the
+    server cannot be reached.
+    """
+    digest = hashlib.sha256(html_bytes).hexdigest()
+    cache_path = cache_dir / f"{digest}.md"
+    try:
+        markdown = cache_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        pass
+    else:
+        os.utime(cache_path)
+        return markdown
+
+    markdown = _run_pandoc(html_bytes, server_url)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write-then-rename so concurrent workers never read a partial entry.
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(markdown, encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+    return markdown
+
+
+def _prune_pandoc_cache(cache_dir: Path, started: float) -> None:
+    """Delete cache entries that were neither read nor written since started."""
+    try:
+        it = os.scandir(cache_dir)
+    except FileNotFoundError:
+        return
+    removed = 0
+    with it:
+        for dir_entry in it:
+            if dir_entry.stat().st_mtime < started:
+                os.unlink(dir_entry.path)
+                removed += 1
+    if removed:
+        logger.debug("Pruned {count} stale pandoc cache entries", count=removed)
+
+
+def _run_pandoc(html_bytes: bytes, server_url: str | None) -> str:
+    """Run pandoc (server or CLI) on UTF-8 ``html_bytes`` and return gfm markdown.
 
-def _pandoc_html_to_markdown(html_text: str) -> str:
-    """Convert HTML to markdown using pandoc."""
-    if shutil.which("pandoc") is None:
+    The CLI is fed and read as raw bytes; only its output is decoded, once.
+    """
+    if server_url is not None:
+        # URLError, timeouts, and dropped connections are all OSErrors;
+        # IncompleteRead and friends are HTTPExceptions.
+        try:
+            markdown = _pandoc_server_convert(html_bytes, server_url)
+        except (OSError, http.client.HTTPException, orjson.JSONDecodeError) as exc:
+            logger.debug("pandoc server request failed ({error}); using CLI", error=exc)
+        else:
+            if markdown is not None:
+                return markdown.strip() + "\n"
+    if _PANDOC_BIN is None:
         raise FileNotFoundError("pandoc is required but was not found on PATH")
     result = subprocess.run(
-        ["pandoc", "-f", "html", "-t", "gfm"],
-        input=html_text,
-        text=True,
+        [_PANDOC_BIN, "-f", "html", "-t", "gfm"],
+        input=html_bytes,
         capture_output=True,
         check=False,
     )
     if result.returncode != 0:
-        raise RuntimeError(f"pandoc failed: {result.stderr.strip()}")
-    return result.stdout.strip() + "\n"
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"pandoc failed: {stderr}")
+    return result.stdout.strip().decode("utf-8") + "\n"
+
+
+class _SimpleMarkdownWriter(HTMLParser):
+    """Render paragraph/heading/emphasis-only HTML as gfm markdown."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.blocks: list[str] = []
+        self._parts: list[str] = []
+        self._prefix = ""
+        self._skip_depth = 0
+        # Open emphasis markers: [index into _parts, has non-space content].
+        self._open: list[list[Any]] = []
+
+    def _flush(self) -> None:
+        text = " ".join("".join(self._parts).split())
+        if "\0" in text:
+            text = text.replace(" \0", "\0").replace("\0 ", "\0")
+            # Only "#" can start a block after a hard break in pandoc's output.
+            first, *rest = text.split("\0")
+            text = "\\\n".join(
+                [first] + ["\\" + line if line[:1] == "#" else line for line in rest]
+            )
+        if text:
+            match = _BLOCK_START_RE.match(text)
+            if match is not None:
+                end = match.end()
+                if match.group().isdigit():
+                    text = text[:end] + "\\" + text[end:]
+                else:
+                    text = "\\" + text
+            self.blocks.append(self._prefix + text)
+        self._parts = []
+        self._prefix = ""
+        self._open = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in {"head", "title"}:
+            self._skip_depth += 1
+        elif tag == "p":
+            self._flush()
+        elif len(tag) == 2 and tag[0] == "h" and tag[1].isdigit():
+            self._flush()
+            self._prefix = "#" * int(tag[1]) + " "
+        elif tag == "br":
+            # Placeholder survives whitespace collapsing; becomes a hard break.
+            self._parts.append("\0")
+        elif tag in _INLINE_MARKERS:
+            self._parts.append(_INLINE_MARKERS[tag])
+            self._open.append([len(self._parts) - 1, False])
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in {"head", "title"}:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "p" or (len(tag) == 2 and tag[0] == "h" and tag[1].isdigit()):
+            self._flush()
+        elif tag in _INLINE_MARKERS:
+            if self._open:
+                index, has_content = self._open.pop()
+                if not has_content:
+                    # Empty emphasis renders as nothing, as in pandoc.
+                    self._parts[index] = self._parts[index].replace(
+                        _INLINE_MARKERS[tag], ""
+                    )
+                    return
+            # Keep trailing whitespace outside the closing marker.
+            trailing = ""
+            if self._parts and self._parts[-1][-1:].isspace():
+                trailing = " "
+                self._parts[-1] = self._parts[-1].rstrip()
+            self._parts.append(_INLINE_MARKERS[tag] + trailing)
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        text = data.translate(_MARKDOWN_ESCAPES)
+        if self._open and not self._open[-1][1]:
+            # Keep leading whitespace outside the opening marker.
+            stripped = text.lstrip()
+            if stripped != text:
+                index = self._open[-1][0]
+                self._parts[index] = " " + self._parts[index]
+                text = stripped
+        if text:
+            for opened in self._open:
+                opened[1] = True
+        self._parts.append(text)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+
+def _fast_html_to_markdown(html_bytes: bytes) -> str | None:
+    """Convert plain paragraph/heading chapters without spawning pandoc.
+
+    Returns:
+        The markdown text, or None when the HTML uses tags outside
+        ``_SIMPLE_TAGS`` (or comments) and needs pandoc.
+    """
+    if b"<!--" in html_bytes:
+        return None
+    for match in _TAG_NAME_RE.finditer(html_bytes):
+        if match.group(1).lower().decode("ascii") not in _SIMPLE_TAGS:
+            return None
+    writer = _SimpleMarkdownWriter()
+    writer.feed(html_bytes.decode("utf-8"))
+    writer.close()
+    return "\n\n".join(writer.blocks) + "\n"
 
 
 def _postprocess_markdown(
     markdown: str, chapter_title: str, chapter_number: int | None
 ) -> str:
     """Post-process pandoc markdown output for custom formatting."""
-    # remove page ID spans
-    page_regex: re.Pattern = re.compile(r"<span id=\"page_\d+\"></span>")
-    if page_regex.search(markdown):
-        markdown = re.sub(page_regex, "", markdown)
+    heading = f"# Chapter {chapter_number}: {chapter_title}"
 
-    head_regex = re.compile(
-        r"(?:# .+\n\n)?<div class=\"class_.+>\n\n(\d+)\n\n# (.+)\n\n</div>"
-    )
-    if head_regex.search(markdown):
-        markdown = re.sub(
-            head_regex, f"# Chapter {chapter_number}: {chapter_title}", markdown
-        )
+    def dispatch(match: re.Match[str]) -> str:
+        if match.lastgroup == "head":
+            return heading
+        return f"**{match.group('bold_text')}**"
 
-    # Fix newlines
-    parts = markdown.split("\n\n")
-    if len(parts) > 1:
-        markdown = "\n\n".join(part.replace("\n", " ") for part in parts)
-    else:
-        markdown = markdown.replace("\n", " ")
+    # remove page ID spans
+    markdown = _PAGE_SPAN_RE.sub("", markdown)
+    markdown = _POSTPROCESS_RE.sub(dispatch, markdown)
 
-    bold_span_regex = re.compile(r"<span class=\".+\">\s*(.*?)\s*</span>")
-    if bold_span_regex.search(markdown, re.IGNORECASE, re.MULTILINE):
-        logger.debug("Replaceing bold spans...")
-        markdown = bold_span_regex.sub(r"**\g<1>** ", markdown)
+    # Fix newlines: join wrapped lines but keep paragraph breaks.
+    markdown = _SOFT_NL_RE.sub(" ", markdown)
 
-    logger.trace(f"Post-post {markdown=}")
-    progress.console.print(Markdown(markdown))
+    logger.trace("Post-processed markdown: {length} chars", length=len(markdown))
 
     # if "</div>" in markdown:
     #     markdown_split = markdown.split('</div>')
@@ -83,11 +358,9 @@ def _replace_rule(markdown: str) -> str:
     Returns:
         str: The edited markdown text.
     """
-    rule_html = r"<div[\s\S]+<img[\s\S]+</div>"
-    rule_subst = "<div style=\"width:75%;margin:auto;\">\\n\\t<img src=\"rule.svg\" alt=\"\" />\\n</div>"
-    if re.search(rule_html, markdown, re.MULTILINE):
-        logger.debug("Replaceing rule...")
-        markdown = re.sub(rule_html, rule_subst, markdown, re.MULTILINE)
+    markdown, replaced = _RULE_RE.subn(lambda _match: _RULE_SUBST, markdown)
+    if replaced:
+        logger.debug("Replaced {count} rules", count=replaced)
     return markdown
 
 def _replace_bold_spans(markdown: str) -> str:
@@ -97,25 +370,86 @@ def _replace_bold_spans(markdown: str) -> str:
     Returns:
         str: The edited markdown text.
     """
-    bold_regex = re.compile(
-        r"(<span class=\".+\">\s*(.+)\s*<\/span>)",
-        re.MULTILINE
-    )
-    while bold_regex.search(markdown):
-        logger.debug("Replacing bold span...")
-        markdown = re.sub(bold_regex, "**\\g<2>**", markdown, re.MULTILINE)
+    markdown, replaced = _BOLD_RE.subn(r"**\2**", markdown)
+    if replaced:
+        logger.debug("Replaced {count} bold spans", count=replaced)
     return markdown
 
 
+def _convert_chapter(
+    entry: dict[str, Any],
+    *,
+    extracted_abs: Path,
+    extracted_root: Path,
+    markdown_root: Path,
+    audio_root: Path,
+    cache_dir: Path,
+    server_url: str | None = None,
+) -> tuple[Path, dict[str, str]] | None:
+    """Convert one TOC entry's chapter to markdown.
+
+    Runs in a worker process, so the entry is never mutated here; the caller
+    applies the returned ``markdown`` (and ``audio`` when the entry has a
+    label) paths to its own copy.
+
+    Returns:
+        The written markdown path and the TOC fields to update, or None when
+        the chapter source is missing.
+    """
+    chapter_title = entry.get("chapter_title") or f"Chapter {entry.get('order')}"
+    chapter_number = entry.get("chapter_number") or entry.get("order")
+    chapter_path = _resolve_chapter_path(entry, extracted_abs)
+    if not chapter_path.exists():
+        progress.console.log(f"Chapter path missing: {chapter_path}")
+        return None
+
+    # Read raw HTML bytes
+    html_bytes = chapter_path.read_bytes()
+
+    # Convert HTML text to markdown, using pandoc unless the chapter is plain
+    markdown = _fast_html_to_markdown(html_bytes)
+    if markdown is None:
+        markdown = _pandoc_html_to_markdown(html_bytes, cache_dir, server_url)
+
+    # Postprocess markdown text
+    markdown = _postprocess_markdown(markdown, str(chapter_title), chapter_number)
+    markdown = _replace_rule(markdown)
+    markdown = _replace_bold_spans(markdown)
+
+    try:
+        chapter_rel = chapter_path.relative_to(extracted_root)
+    except ValueError:
+        chapter_rel = Path(chapter_path.name)
+
+    output_path = (markdown_root / chapter_rel).with_suffix(".md")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(f"{markdown}", encoding="utf-8")
+    updates = {"markdown": output_path.as_posix()}
+    chapter_label = entry.get("chapter_number") or entry.get("order")
+    if chapter_label is not None:
+        title_for_audio = (
+            str(chapter_title).strip() if chapter_title else f"Chapter {chapter_label}"
+        )
+        audio_name = f"{chapter_label}. {title_for_audio}"
+        updates["audio"] = (audio_root / f"{audio_name}.m4a").as_posix()
+    return output_path, updates
+
+
 def convert_to_markdown(
     stem: str,
     base_dir: Path = Path("static"),
+    *,
+    toc_entries: list[dict[str, Any]] | None = None,
+    on_chapter: Callable[[dict[str, Any]], None] | None = None,
 ) -> list[Path]:
     """Convert chapter HTML to markdown files under static/{stem}/markdown.
 
     Args:
         stem: EPUB stem used to locate toc.json and extracted files.
         base_dir: Base directory containing per-book folders.
+        toc_entries: Already-loaded toc.json entries to update in place; read
+            from disk when omitted.
+        on_chapter: Called with each TOC entry as soon as its markdown is written.
     Returns:
         List of written markdown file paths.
     """
@@ -128,73 +462,60 @@ def convert_to_markdown(
     if not extracted_root.exists():
         raise FileNotFoundError(f"Extracted directory not found: {extracted_root}")
 
+    extracted_abs = extracted_root.absolute()
+
     # Markdown
     markdown_root = book_dir / "markdown"
     if not markdown_root.exists():
-        logger.debug(f"Creating markdown directory: '{markdown_root.resolve()}'")
+        logger.debug("Creating markdown directory: '{path}'", path=markdown_root)
         markdown_root.mkdir(parents=True, exist_ok=True)
     audio_root = book_dir / "audio"
     if not audio_root.exists():
-        logger.debug(f"Creating audio directory: '{audio_root.resolve()}'")
+        logger.debug("Creating audio directory: '{path}'", path=audio_root)
     audio_root.mkdir(parents=True, exist_ok=True)
 
     rule_svg_path = markdown_root / "rule.svg"
-    if not rule_svg_path.exists():
-        rule_svg_path.write_text(RULE_SVG, encoding="utf-8")
+    if not rule_svg_path.is_file():
+        rule_svg_path.write_bytes(RULE_SVG)
 
-    toc_entries: list[dict[str, Any]] = json.loads(toc_path.read_text(encoding="utf-8"))
+    if toc_entries is None:
+        toc_entries = orjson.loads(toc_path.read_bytes())
     written: list[Path] = []
     toc_updated = False
+    # Pandoc output is cached per book; entries unused by this run are pruned.
+    cache_dir = book_dir / "cache" / "pandoc"
+    started = int(time.time())
 
     convert_md_task = progress.add_task(
         "Converting chapters to markdown",
         total=len(toc_entries),
     )
-    with progress:
-        for entry in toc_entries:
-            chapter_title = (
-                entry.get("chapter_title") or f"Chapter {entry.get('order')}"
-            )
-            chapter_number = entry.get("chapter_number") or entry.get("order")
-            chapter_path = _resolve_chapter_path(entry, extracted_root)
-            if not chapter_path.exists():
-                progress.console.log(f"Chapter path missing: {chapter_path}")
-                progress.advance(convert_md_task)
-                continue
-
-            # Read HTML text
-            html_text = chapter_path.read_text(encoding="utf-8")
-
-            # Convert HTML text to markdown using pandoc
-            markdown = _pandoc_html_to_markdown(html_text)
-
-            # Postprocess markdown text
-            markdown = _postprocess_markdown(
-                markdown, str(chapter_title), chapter_number
-            )
-            markdown = _replace_rule(markdown)
-            markdown = _replace_bold_spans(markdown)
-
-            try:
-                chapter_rel = chapter_path.relative_to(extracted_root)
-            except ValueError:
-                chapter_rel = Path(chapter_path.name)
-
-            output_path = (markdown_root / chapter_rel).with_suffix(".md")
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(f"{markdown}", encoding="utf-8")
-            written.append(output_path)
-            entry["markdown"] = output_path.as_posix()
-            chapter_label = entry.get("chapter_number") or entry.get("order")
-            if chapter_label is not None:
-                title_for_audio = (
-                    str(chapter_title).strip()
-                    if chapter_title
-                    else f"Chapter {chapter_label}"
-                )
-                audio_name = f"{chapter_label}. {title_for_audio}"
-                entry["audio"] = (audio_root / f"{audio_name}.m4a").as_posix()
-            toc_updated = True
+    # Workers get snapshots: the HTML stage may still be adding keys to the
+    # shared entries while they are pickled.
+    snapshots = [dict(entry) for entry in toc_entries]
+    with (
+        progress,
+        _pandoc_server() as server_url,
+        ProcessPoolExecutor(max_workers=os.cpu_count()) as executor,
+    ):
+        convert_chapter = functools.partial(
+            _convert_chapter,
+            extracted_abs=extracted_abs,
+            extracted_root=extracted_root,
+            markdown_root=markdown_root,
+            audio_root=audio_root,
+            cache_dir=cache_dir,
+            server_url=server_url,
+        )
+        results = executor.map(convert_chapter, snapshots, chunksize=4)
+        for entry, result in zip(toc_entries, results):
+            if result is not None:
+                output_path, updates = result
+                entry.update(updates)
+                written.append(output_path)
+                toc_updated = True
+                if on_chapter is not None:
+                    on_chapter(entry)
             progress.advance(convert_md_task)
 
     logger.info(  # type: ignore
@@ -203,9 +524,7 @@ def convert_to_markdown(
         path=markdown_root,
     )
     if toc_updated:
-        toc_path.write_text(
-            json.dumps(toc_entries, ensure_ascii=False, indent=2) + "\n",
-            encoding="utf-8",
-        )
+        write_toc(toc_path, toc_entries)
+    _prune_pandoc_cache(cache_dir, started)
 
     return written
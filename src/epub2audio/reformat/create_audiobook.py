@@ -3,13 +3,17 @@
 
 from __future__ import annotations
 
-import json
+import functools
+import os
 import re
+import string
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 from xml.etree import ElementTree
 
+import orjson
 import typer
 
 from epub2audio.utils.logging import get_logger
@@ -17,69 +21,80 @@ from epub2audio.utils.logging import get_logger
 app = typer.Typer(add_completion=False)
 logger = get_logger()
 
+_COVER_NAMES = ("cover.jpg", "cover.png", "cover.jpeg")
+_AUDIO_SUFFIXES = frozenset({".m4a", ".m4b", ".mp3", ".aac"})
+_AUDIO_STEM_RE = re.compile(r"^\s*(\d+)\s*[.\-–:_)]\s*(.*)$")
+_NORM_RE = re.compile(r"[^a-z0-9]+")
+_STEM_SEPARATORS = str.maketrans(dict.fromkeys(string.punctuation, " "))
+_FFMETADATA_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\n": " ", "=": "\\=", ";": "\\;", "#": "\\#"}
+)
+
 
 def _load_toc(toc_path: Path) -> list[dict[str, Any]]:
     """Load toc.json entries from disk."""
     if not toc_path.exists():
         raise FileNotFoundError(f"toc.json not found: {toc_path}")
-    return json.loads(toc_path.read_text(encoding="utf-8"))
+    return orjson.loads(toc_path.read_bytes())
 
 
+@functools.lru_cache(maxsize=4096)
 def _normalize_title(value: str) -> str:
     """Normalize a title for fuzzy matching against filenames."""
-    lowered = value.strip().lower()
-    cleaned = re.sub(r"[^a-z0-9]+", " ", lowered)
-    return " ".join(cleaned.split())
+    return " ".join(_NORM_RE.sub(" ", value.lower()).split())
 
 
 def _humanize_stem(stem: str) -> str:
     """Convert a stem into a title-cased name with de-padded numbers."""
-    parts = re.split(r"[^a-zA-Z0-9]+", stem.strip())
-    words: list[str] = []
-    for part in parts:
-        if not part:
-            continue
-        if part.isdigit():
-            words.append(str(int(part)))
-        else:
-            words.append(part)
-    return " ".join(words).title()
+    words = stem.translate(_STEM_SEPARATORS).split()
+    return " ".join(
+        str(int(word)) if word.isascii() and word.isdigit() else word for word in words
+    ).title()
 
 
-def _index_audio_files(audio_root: Path) -> tuple[dict[int, Path], dict[str, Path]]:
-    """Index audio files by leading number and normalized title."""
+def _index_audio_files(
+    audio_root: Path,
+) -> tuple[dict[int, Path], dict[str, Path], dict[str, Path]]:
+    """Index audio files by leading number, normalized title and filename."""
     by_number: dict[int, Path] = {}
     by_title: dict[str, Path] = {}
+    by_name: dict[str, Path] = {}
     if not audio_root.exists():
-        return by_number, by_title
-
-    for path in sorted(audio_root.iterdir()):
-        if not path.is_file():
-            continue
-        if path.suffix.lower() not in {".m4a", ".m4b", ".mp3", ".aac"}:
-            continue
-        stem = path.stem
-        match = re.match(r"^\s*(\d+)\s*[.\-–:_)]\s*(.*)$", stem)
-        if match:
-            number = int(match.group(1))
-            by_number.setdefault(number, path)
-            title_part = match.group(2).strip()
-        else:
-            title_part = stem
-        if title_part:
-            by_title.setdefault(_normalize_title(title_part), path)
-    return by_number, by_title
+        return by_number, by_title, by_name
+
+    # Single unsorted scandir pass; on key collisions the lexically smallest
+    # filename wins, matching the old sorted-iteration setdefault behaviour.
+    with os.scandir(audio_root) as it:
+        for dir_entry in it:
+            name = dir_entry.name
+            dot = name.rfind(".")
+            if dot <= 0 or name[dot:].lower() not in _AUDIO_SUFFIXES:
+                continue
+            if not dir_entry.is_file():
+                continue
+            stem = name[:dot]
+            path = Path(dir_entry.path)
+            by_name[name] = path
+            match = _AUDIO_STEM_RE.match(stem)
+            if match:
+                number = int(match.group(1))
+                current = by_number.get(number)
+                if current is None or name < current.name:
+                    by_number[number] = path
+                title_part = match.group(2).strip()
+            else:
+                title_part = stem
+            if title_part:
+                key = _normalize_title(title_part)
+                current = by_title.get(key)
+                if current is None or name < current.name:
+                    by_title[key] = path
+    return by_number, by_title, by_name
 
 
 def _escape_ffmetadata(value: str) -> str:
     """Escape a metadata value for ffmetadata format."""
-    return (
-        value.replace("\\", "\\\\")
-        .replace("\n", " ")
-        .replace("=", "\\=")
-        .replace(";", "\\;")
-        .replace("#", "\\#")
-    )
+    return value.translate(_FFMETADATA_ESCAPES)
 
 
 def _ffprobe_duration_ms(path: Path) -> int:
@@ -99,23 +114,53 @@ def _ffprobe_duration_ms(path: Path) -> int:
     return max(0, int(round(seconds * 1000)))
 
 
+def _iter_files(root: Path) -> Iterator[os.DirEntry[str]]:
+    """Yield the files below ``root`` with a single ``os.scandir`` walk."""
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for dir_entry in it:
+                if dir_entry.is_dir(follow_symlinks=False):
+                    stack.append(dir_entry.path)
+                elif dir_entry.is_file():
+                    yield dir_entry
+
+
 def _find_cover(extracted_dir: Path) -> Path | None:
     """Locate the cover image for the extracted EPUB."""
     candidate = extracted_dir / "cover.jpeg"
     if candidate.exists():
         return candidate
-    for name in ("cover.jpg", "cover.png", "cover.jpeg"):
-        for path in extracted_dir.rglob(name):
-            return path
-    return None
+    # One walk for all names; earlier names in _COVER_NAMES win.
+    best: tuple[int, str] | None = None
+    for dir_entry in _iter_files(extracted_dir):
+        name = dir_entry.name.lower()
+        if name not in _COVER_NAMES:
+            continue
+        rank = _COVER_NAMES.index(name)
+        if rank == 0:
+            return Path(dir_entry.path)
+        if best is None or rank < best[0]:
+            best = (rank, dir_entry.path)
+    return Path(best[1]) if best else None
 
 
 def _find_opf(extracted_dir: Path) -> Path | None:
-    """Locate the OPF metadata file for the extracted EPUB."""
-    if not extracted_dir.exists():
-        return None
-    candidates = sorted(extracted_dir.rglob("*.opf"))
-    return candidates[0] if candidates else None
+    """Locate the OPF metadata file for the extracted EPUB.
+
+    When there are several, the first in sorted path order wins, so the
+    choice does not depend on directory iteration order.
+    """
+    candidates = [
+        Path(dir_entry.path)
+        for dir_entry in _iter_files(extracted_dir)
+        if dir_entry.name.lower().endswith(".opf")
+    ]
+    return min(candidates, default=None)
 
 
 def _load_opf_metadata(opf_path: Path) -> tuple[str | None, list[str]]:
@@ -144,13 +189,11 @@ def _build_concat_list(paths: list[Path], output_path: Path | None, stem: str) -
     if output_path is None:
         output_path = Path("static") / stem / "txt" / "concat.txt"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    lines = []
-    for path in paths:
-        safe_path = str(path.resolve()).replace("'", "'\\''")
-        logger.trace(f"Appending {safe_path=} to lines...")
-        lines.append(f"file '{safe_path}'")
-
-    output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    with output_path.open("w", encoding="utf-8", buffering=1 << 16) as handle:
+        for path in paths:
+            safe_path = str(path.resolve()).replace("'", "'\\''")
+            logger.trace("Appending {path} to concat list...", path=safe_path)
+            handle.write(f"file '{safe_path}'\n")
 
 
 def _build_ffmetadata(
@@ -162,34 +205,35 @@ def _build_ffmetadata(
 ) -> None:
     """Write ffmetadata chapters file aligned to the audio files."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    lines = [";FFMETADATA1", f"title={_escape_ffmetadata(book_title)}"]
-    if author:
-        escaped_author = _escape_ffmetadata(author)
-        lines.extend([f"artist={escaped_author}", f"album_artist={escaped_author}"])
-    current_ms = 0
-    for entry, audio_path in zip(entries, audio_paths, strict=True):
-        duration_ms = _ffprobe_duration_ms(audio_path)
-        raw_title = entry.get("chapter_title") or audio_path.stem
-        chapter_number = entry.get("chapter_number")
-        if chapter_number:
-            if raw_title:
-                title = f"Chapter {chapter_number}: {raw_title}"
+    # ffprobe runs are independent subprocess waits, so probe them all at once.
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(audio_paths)))) as executor:
+        durations = list(executor.map(_ffprobe_duration_ms, audio_paths))
+    with output_path.open("w", encoding="utf-8", buffering=1 << 16) as handle:
+        handle.write(";FFMETADATA1\n")
+        handle.write(f"title={_escape_ffmetadata(book_title)}\n")
+        if author:
+            escaped_author = _escape_ffmetadata(author)
+            handle.write(f"artist={escaped_author}\nalbum_artist={escaped_author}\n")
+        current_ms = 0
+        for entry, audio_path, duration_ms in zip(
+            entries, audio_paths, durations, strict=True
+        ):
+            raw_title = entry.get("chapter_title") or audio_path.stem
+            chapter_number = entry.get("chapter_number")
+            if chapter_number:
+                if raw_title:
+                    title = f"Chapter {chapter_number}: {raw_title}"
+                else:
+                    title = f"Chapter {chapter_number}"
             else:
-                title = f"Chapter {chapter_number}"
-        else:
-            title = raw_title
-        lines.extend(
-            [
-                "",
-                "[CHAPTER]",
-                "TIMEBASE=1/1000",
-                f"START={current_ms}",
-                f"END={current_ms + duration_ms}",
-                f"title={_escape_ffmetadata(str(title))}",
-            ]
-        )
-        current_ms += duration_ms
-    output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+                title = raw_title
+            handle.write(
+                "\n[CHAPTER]\nTIMEBASE=1/1000\n"
+                f"START={current_ms}\n"
+                f"END={current_ms + duration_ms}\n"
+                f"title={_escape_ffmetadata(str(title))}\n"
+            )
+            current_ms += duration_ms
 
 
 def _build_audiobook(
@@ -197,15 +241,22 @@ def _build_audiobook(
     stem: str,
     base_dir: Path,
     output: Path | None,
+    toc_entries: list[dict[str, Any]] | None = None,
 ) -> Path:
-    """Create an M4B audiobook with chapters and cover art."""
+    """Create an M4B audiobook with chapters and cover art.
+
+    ``toc_entries`` may be passed by callers that already hold the parsed
+    toc.json to avoid reading it from disk again.
+    """
     book_dir = base_dir / stem
-    toc_path = book_dir / "json" / "toc.json"
-    logger.info("Loading TOC: {path}", path=toc_path)
-    entries = sorted(_load_toc(toc_path), key=lambda item: item.get("order", 0))
+    if toc_entries is None:
+        toc_path = book_dir / "json" / "toc.json"
+        logger.info("Loading TOC: {path}", path=toc_path)
+        toc_entries = _load_toc(toc_path)
+    entries = sorted(toc_entries, key=lambda item: item.get("order", 0))
 
     audio_root = book_dir / "audio"
-    by_number, by_title = _index_audio_files(audio_root)
+    by_number, by_title, by_name = _index_audio_files(audio_root)
 
     audio_paths: list[Path] = []
     used_entries: list[dict[str, Any]] = []
@@ -214,11 +265,12 @@ def _build_audiobook(
         if not audio_value:
             audio_path = None
         else:
-            audio_path = Path(audio_value)
-            if not audio_path.is_absolute() and not audio_path.exists():
-                audio_path = audio_root / audio_path
-            if not audio_path.exists():
-                audio_path = None
+            # Trust the directory index instead of stat-ing every TOC path;
+            # only absolute paths outside audio_root still hit the filesystem.
+            candidate = Path(audio_value)
+            audio_path = by_name.get(candidate.name)
+            if audio_path is None and candidate.is_absolute() and candidate.is_file():
+                audio_path = candidate
 
         if audio_path is None:
             chapter_number = entry.get("chapter_number")
@@ -6,11 +6,12 @@ import re
 # import sys
 from pathlib import Path
 from typing import Any
-import json
-from xml.etree import ElementTree as ET
+
+from lxml import etree as ET
 from rich.pretty import Pretty
 
 from epub2audio.utils.logging import get_logger, get_console
+from epub2audio.utils.toc import write_toc
 
 logger = get_logger()
 console = get_console()
@@ -41,42 +42,46 @@ _BACK_MATTER_KEYWORDS = (
 
 _FONT_EXTENSIONS = (".ttf", ".otf", ".woff", ".woff2")
 
+# One search per string: titles are checked for "font" and back-matter
+# keywords, chapter paths for "font" and font file extensions.
+_TITLE_SKIP_RE = re.compile("|".join(map(re.escape, ("font", *_BACK_MATTER_KEYWORDS))))
+_PATH_SKIP_RE = re.compile(f"font|(?:{'|'.join(map(re.escape, _FONT_EXTENSIONS))})$")
+_CHAPTER_NUM_RE = re.compile(r"^(\d+)\.")
 
-def _should_skip_entry(title: str, chapter_path: str | None) -> bool:
-    """Return True when the TOC entry should be excluded."""
-    title_lower = title.strip().lower()
-    path_lower = chapter_path.strip().lower() if chapter_path else ""
+# Where EPUB packagers conventionally put the NCX, checked before walking.
+_TOC_NCX_LOCATIONS = ("toc.ncx", "OEBPS/toc.ncx", "OPS/toc.ncx", "EPUB/toc.ncx")
 
-    if "font" in title_lower or "font" in path_lower:
-        return True
 
-    if path_lower.endswith(_FONT_EXTENSIONS):
-        return True
+def _should_skip_entry(title_lower: str, chapter_path: str | None) -> bool:
+    """Return True when the TOC entry should be excluded.
 
-    for keyword in _BACK_MATTER_KEYWORDS:
-        if keyword in title_lower:
-            return True
+    Args:
+        title_lower: The entry title, already stripped and lowercased.
+        chapter_path: The entry's content ``src``, if any.
+    """
+    path_lower = chapter_path.strip().lower() if chapter_path else ""
 
-    return False
+    if _PATH_SKIP_RE.search(path_lower):
+        return True
+    # Fast path: bare "Chapter N" headings cannot contain a skip keyword.
+    if title_lower.startswith("chapter ") and title_lower[8:].isdigit():
+        return False
+    return _TITLE_SKIP_RE.search(title_lower) is not None
 
 
 def _find_toc_ncx(extracted_dir: Path) -> Path:
     """Locate toc.ncx within an extracted EPUB directory."""
-    candidate = extracted_dir / "toc.ncx"
-    if candidate.exists():
-        logger.trace("Found toc.ncx at root: {path}", path=candidate)
-        return candidate
-    matches = list(extracted_dir.rglob("toc.ncx"))
-    if not matches:
+    for relative in _TOC_NCX_LOCATIONS:
+        candidate = extracted_dir / relative
+        if candidate.is_file():
+            logger.trace("Found toc.ncx at {path}", path=candidate)
+            return candidate
+    match = next(extracted_dir.rglob("toc.ncx"), None)
+    if match is None:
         logger.error("toc.ncx not found under {path}", path=extracted_dir)
         raise FileNotFoundError(f"toc.ncx not found under {extracted_dir}")
-    if len(matches) > 1:
-        logger.trace(
-            "Multiple toc.ncx files found; using first match: {path}", path=matches[0]
-        )
-    else:
-        logger.trace("[i green]Found toc.ncx:[/i green] [b #00ff00]{path}", path=matches[0])
-    return matches[0]
+    logger.trace("[i green]Found toc.ncx:[/i green] [b #00ff00]{path}", path=match)
+    return match
 
 
 def _get_namespace(tag: str) -> str:
@@ -86,17 +91,22 @@ def _get_namespace(tag: str) -> str:
     return ""
 
 
-def _parse_chapter_number(title: str | None) -> int | None:
-    """Parse an integer chapter number from a title like 'Chapter 12'."""
-    logger.trace(f"Entered _parse_chapter_number({title=})")
+def _parse_chapter_number(title: str | None) -> tuple[int | None, str]:
+    """Split a leading chapter number off a title like '12. The Ascent'.
+
+    Returns:
+        The chapter number (None when the title has no ``N.`` prefix) and the
+        title with that prefix removed.
+    """
+    logger.trace("Entered _parse_chapter_number(title={title!r})", title=title)
     if not title:
         logger.trace('No title found. returning `None`')
-        return None
+        return None, ""
 
-    match = re.search(r"^(\d+)\.", title, re.IGNORECASE)
+    match = _CHAPTER_NUM_RE.match(title)
     if match:
-        return int(match.group(1))
-    return None
+        return int(match.group(1)), title[match.end():].lstrip()
+    return None, title
 
 
 def generate_toc(extracted_dir: Path) -> list[dict[str, Any]]:
@@ -108,40 +118,58 @@ def generate_toc(extracted_dir: Path) -> list[dict[str, Any]]:
       - chapter_title: str
       - chapter_path: str
     """
-    logger.trace(f"Entered generate_toc({extracted_dir=}...)")
+    logger.trace("Entered generate_toc(extracted_dir={path}...)", path=extracted_dir)
     extracted_dir = (
         extracted_dir if isinstance(extracted_dir, Path) else Path(extracted_dir)
     )
     if not extracted_dir.exists():
-        logger.error(f"Invalid directory: {extracted_dir}")
+        logger.error("Invalid directory: {path}", path=extracted_dir)
         raise FileNotFoundError(f"Invalid directory: {extracted_dir}")
 
     toc_path = _find_toc_ncx(extracted_dir)
-    logger.trace(f"Parsing toc.ncx: {toc_path=}")
-    tree = ET.parse(toc_path)
-    root = tree.getroot()
-    ns = _get_namespace(root.tag)
-
-    def q(tag: str) -> str:
-        return f"{{{ns}}}{tag}" if ns else tag
-
-    nav_map = root.find(f".//{q('navMap')}")
-    if nav_map is None:
-        logger.trace(f"No navMap found in toc.ncx: {toc_path}")
-        return []
-
+    logger.trace("Parsing toc.ncx: {path}", path=toc_path)
+    # Stream the NCX: navPoints are numbered in document order on "start"
+    # (matching a preorder .//navPoint walk) and read on "end", after which
+    # the element is cleared so memory stays bounded by nesting depth.
+    nav_map_tag = navpoint_tag = label_path = content_tag = ""
+    nav_map_seen = False
+    next_order = 1
+    open_orders: list[int] = []
     toc: list[dict[str, Any]] = []
-    for order, nav_point in enumerate(nav_map.findall(f".//{q('navPoint')}"), start=1):
-        label_node = nav_point.find(f"{q('navLabel')}/{q('text')}")
-        # logger.trace(f"{label_node=}")
+    for event, elem in ET.iterparse(str(toc_path), events=("start", "end")):
+        if not nav_map_tag:
+            # First event is the root element; it carries the NCX namespace.
+            ns = _get_namespace(elem.tag)
+            prefix = f"{{{ns}}}" if ns else ""
+            nav_map_tag = f"{prefix}navMap"
+            navpoint_tag = f"{prefix}navPoint"
+            label_path = f"{prefix}navLabel/{prefix}text"
+            content_tag = f"{prefix}content"
+
+        if elem.tag == nav_map_tag:
+            if event == "start":
+                nav_map_seen = True
+                continue
+            # Only the first navMap is used, and the pageList/navList that
+            # usually follow it can be large, so stop parsing here.
+            break
+        if not nav_map_seen or elem.tag != navpoint_tag:
+            continue
+        if event == "start":
+            open_orders.append(next_order)
+            next_order += 1
+            continue
+
+        order = open_orders.pop()
+        label_node = elem.find(label_path)
         title = (label_node.text or "").strip() if label_node is not None else ""
-        content_node = nav_point.find(f"{q('content')}")
+        content_node = elem.find(content_tag)
         chapter_path = content_node.get("src") if content_node is not None else ""
-        # play_order = nav_point.get("playOrder")
+        elem.clear()
 
-        chapter_number = _parse_chapter_number(title)
+        chapter_number, chapter_title = _parse_chapter_number(title)
         if chapter_number:
-            title = title.lstrip(f"{chapter_number}. ")
+            title = chapter_title
 
         if not chapter_number:
             logger.trace(
@@ -151,7 +179,7 @@ def generate_toc(extracted_dir: Path) -> list[dict[str, Any]]:
             )
             continue
 
-        if _should_skip_entry(title, chapter_path):
+        if _should_skip_entry(title.lower(), chapter_path):
             logger.trace(
                 "Skipping TOC entry: {title} ({path})",
                 title=title or f"order {order}",
@@ -166,21 +194,24 @@ def generate_toc(extracted_dir: Path) -> list[dict[str, Any]]:
             "chapter_path": chapter_path
         })
 
+    if not nav_map_seen:
+        logger.trace("No navMap found in toc.ncx: {path}", path=toc_path)
+        return []
+    # Nested navPoints finish before their parents; restore document order.
+    toc.sort(key=lambda entry: entry["order"])
+
     logger.trace(
-        f"Generated TOC with {len(toc)=} entries from {toc_path=}",
+        "Generated TOC with {count} entries from {path}", count=len(toc), path=toc_path
     )
 
     book_dir = extracted_dir.parent
     json_dir = book_dir / "json"
-    if not json_dir.exists():
-        logger.trace(f"Creating json directory for TOC: {json_dir=}")
-        json_dir.mkdir(parents=True, exist_ok=True)
+    json_dir.mkdir(parents=True, exist_ok=True)
 
     TOC_PATH: Path = json_dir / "toc.json" # pylint: disable = C0103:invalid-name
-    logger.trace(f'Writing TOC to {TOC_PATH}...')
-    with open(TOC_PATH, mode="w", encoding="utf-8") as toc_file:
-        json.dump(toc, toc_file, indent=2)
-        logger.trace(f"Wrote TOC to {TOC_PATH}!")
+    logger.trace("Writing TOC to {path}...", path=TOC_PATH)
+    write_toc(TOC_PATH, toc)
+    logger.trace("Wrote TOC to {path}!", path=TOC_PATH)
 
     return toc
 
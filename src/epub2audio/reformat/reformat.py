@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+import os
 import shutil
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from zipfile import ZipFile
+from zipfile import ZipFile, ZipInfo
 
 from slugify import slugify
 
+from epub2audio.reformat import _link_or_copy
 from epub2audio.utils.logging import get_logger
 
 logger = get_logger()
 
+_COPY_BUFSIZE = 1 << 20
+
 
 def reformat_epub(
     epub: str | Path,
@@ -29,15 +35,18 @@ def reformat_epub(
     Returns:
         Path: the path of the reformatted epub's zip archive.
     """
-    logger.trace(f"Entered reformat({epub}...")
+    logger.trace("Entered reformat({epub}...", epub=epub)
 
     # Validate path
     epub_path: Path = epub if isinstance(epub, Path) else Path(epub)
     if not epub_path.exists():
-        logger.error(f"Invalid input: {epub=}")
+        logger.error("Invalid input: epub={epub!r}", epub=epub)
         raise FileNotFoundError(f"Invalid input: {epub=}")
     if epub_path.suffix != ".epub":
-        logger.error(f"Invalid file extension: {epub_path.suffix=}")
+        logger.error(
+            "Invalid file extension: epub_path.suffix={suffix!r}",
+            suffix=epub_path.suffix,
+        )
         raise TypeError(f"Invalid file extension: {epub_path.suffix=}")
 
     # Epub stem
@@ -48,80 +57,139 @@ def reformat_epub(
             epub_stem,
             separator="_",
         )
-    logger.trace(f"{epub_stem=}")
+    logger.trace("epub_stem={stem!r}", stem=epub_stem)
 
-    book_dir = base_dir / epub_stem
+    # Resolve once; every per-book path below derives from these.
+    epub_path_resolved = epub_path.resolve()
+    book_dir = (base_dir / epub_stem).resolve()
     epub_dir_path = book_dir / "epub"
     zip_dir_path = book_dir / "zip"
 
     if copy_to_epub_dir:
-        epub_dir_path = epub_dir_path.resolve()
-        epub_path_resolved = epub_path.resolve()
         target_epub_path = epub_dir_path / f"{epub_stem}.epub"
         if epub_path_resolved == target_epub_path:
             logger.trace("ePub already in epub_dir...")
         else:
-            logger.trace(f"Copying epub to {epub_dir_path}...")
+            logger.trace("Copying epub to {path}...", path=epub_dir_path)
+            epub_dir_path.mkdir(parents=True, exist_ok=True)
 
-            if not epub_dir_path.exists():
-                logger.trace("`epub_dir` does not exist. Making it...")
-                epub_dir_path.mkdir(parents=True, exist_ok=True)
-
-            shutil.copy2(
-                src=epub_path_resolved,
-                dst=target_epub_path,
-            )
+            _link_or_copy(epub_path_resolved, target_epub_path)
             epub_path = target_epub_path
-            logger.trace(f"New epub_path: {epub_path=}")
+            logger.trace("New epub_path: {path}", path=epub_path)
 
-    logger.trace(f"Copying epub to {zip_dir_path} with .zip extension...")
-    if not zip_dir_path.exists():
-        logger.trace("`zip_dir` does not exist. Making it...")
-        zip_dir_path.mkdir(parents=True, exist_ok=True)
+    logger.trace("Copying epub to {path} with .zip extension...", path=zip_dir_path)
+    zip_dir_path.mkdir(parents=True, exist_ok=True)
 
     zip_path = zip_dir_path / f"{epub_stem}.zip"
-    shutil.copy2(
-        src=epub_path,
-        dst=zip_path,
-    )
-    logger.trace(f"Created zip archive copy: {zip_path=}")
+    # An EPUB already is a zip archive, so a hardlink is all that is needed.
+    _link_or_copy(epub_path, zip_path)
+    logger.trace("Created zip archive copy: {path}", path=zip_path)
     return zip_path
 
 
+def _file_crc32(path: Path) -> int:
+    """Return the CRC-32 of a file, read in ``_COPY_BUFSIZE`` chunks."""
+    crc = 0
+    with open(path, "rb") as file:
+        while chunk := file.read(_COPY_BUFSIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _extract_member(zip_file: ZipFile, info: ZipInfo, target_dir: Path) -> bool:
+    """Extract one archive member unless an identical copy is already on disk.
+
+    A member counts as unchanged when the file on disk has the member's size
+    and CRC-32. Written files keep the extraction time as their mtime, so
+    later stages that compare mtimes see the new content.
+
+    Returns:
+        True when the member was written, False when it was skipped.
+    """
+    target = (target_dir / info.filename).resolve()
+    if not target.is_relative_to(target_dir):
+        logger.warning(
+            "Skipping archive member outside target: {name}", name=info.filename
+        )
+        return False
+    if info.is_dir():
+        target.mkdir(parents=True, exist_ok=True)
+        return False
+
+    try:
+        size = target.stat().st_size
+    except FileNotFoundError:
+        pass
+    else:
+        if size == info.file_size and _file_crc32(target) == info.CRC:
+            return False
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with zip_file.open(info) as src, open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst, length=_COPY_BUFSIZE)
+    return True
+
+
+def _extract_members(zip_path: Path, members: list[ZipInfo], target_dir: Path) -> int:
+    """Extract a share of the archive through this worker's own ZipFile handle.
+
+    ZipFile's shared file handle is not safe to open members from several
+    threads at once, so each worker opens the archive itself.
+
+    Returns:
+        The number of members written.
+    """
+    with ZipFile(zip_path, "r") as zip_file:
+        return sum(_extract_member(zip_file, info, target_dir) for info in members)
+
+
 def unzip_epub_zip(
     zip_path: Path,
     extracted_dir: Path | None = None,
-    mkdir: bool = True,
     overwrite: bool = True,
 ) -> Path:
-    """Unzip a .zip copy of an ePub into an extracted directory."""
-    logger.trace(f"Entered unzip_epub_zip({zip_path}...)")
+    """Unzip a .zip copy of an ePub into an extracted directory.
+
+    With ``overwrite`` the directory is wiped and fully re-extracted;
+    otherwise only members that are missing or changed on disk are written.
+    """
+    logger.trace("Entered unzip_epub_zip({path}...)", path=zip_path)
 
     if extracted_dir is None:
         if zip_path.parent.name == "zip":
             extracted_dir = zip_path.parent.parent / "extracted"
         else:
             extracted_dir = zip_path.parent / "extracted"
-    extracted_dir_path = extracted_dir.resolve()
-    target_dir = extracted_dir_path
+    target_dir = extracted_dir.resolve()
 
-    if mkdir and not extracted_dir_path.exists():
-        logger.trace("`extracted_dir` does not exist. Making it...")
-        extracted_dir_path.mkdir(parents=True, exist_ok=True)
-
-    if target_dir.exists():
-        if overwrite:
-            logger.trace("Extracted directory exists; overwriting...")
-            shutil.rmtree(target_dir)
-        else:
-            logger.trace(f"Extracted directory already exists: {target_dir=}")
-            return target_dir
+    if overwrite:
+        logger.trace("Clearing extracted directory before extraction...")
+        shutil.rmtree(target_dir, ignore_errors=True)
+    elif target_dir.exists():
+        logger.trace("Extracted directory exists; refreshing: {path}", path=target_dir)
 
     target_dir.mkdir(parents=True, exist_ok=True)
-    logger.trace(f"Extracting {zip_path} to {target_dir}...")
+    logger.trace("Extracting {src} to {dst}...", src=zip_path, dst=target_dir)
     with ZipFile(zip_path, "r") as zip_file:
-        zip_file.extractall(target_dir)
-    logger.trace(f"Extraction complete: {target_dir=}")
+        members = zip_file.infolist()
+    # Members inflate independently and zlib releases the GIL, so worker
+    # threads overlap decompression with file writes.
+    workers = max(1, min(8, os.cpu_count() or 1, len(members)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        written = sum(
+            executor.map(
+                _extract_members,
+                [zip_path] * workers,
+                [members[index::workers] for index in range(workers)],
+                [target_dir] * workers,
+            )
+        )
+    logger.trace(
+        "Extraction complete: {path} ({written} of {total} written)",
+        path=target_dir,
+        written=written,
+        total=len(members),
+    )
     return target_dir
 
 
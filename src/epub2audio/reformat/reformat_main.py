@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from epub2audio.reformat.convert_html import convert_to_html
@@ -31,31 +32,41 @@ def main(
             copy_to_epub_dir=copy_to_epub_dir,
             slugify_stem=slugify_stem,
         )
-        progress.update(convert_task, advance=1, description="extract zip archive")
+        progress.update(
+            convert_task, advance=1, description="extract zip archive", refresh=False
+        )
         extracted_root = unzip_epub_zip(
             zip_path,
             overwrite=unzip_overwrite,
         )
-        progress.update(convert_task, advance=1, description="create chapters from TOC")
-        generate_toc(extracted_root)
-        stem = extracted_root.parent.name
-        progress.update(
-            convert_task, advance=1, description="convert chapters from HTML"
-        )
-        convert_to_html(
-            stem,
-            base_dir=base_dir,
-        )
         progress.update(
-            convert_task, advance=1, description="converting chapter to Markdown"
-        )
-        markdown_paths = convert_to_markdown(
-            stem,
-            base_dir=base_dir,
+            convert_task,
+            advance=1,
+            description="create chapters from TOC",
+            refresh=False,
         )
+        toc_entries = generate_toc(extracted_root)
+        stem = extracted_root.parent.name
         progress.update(
-            convert_task, advance=1, description="Finished converting to markdown."
+            convert_task,
+            advance=1,
+            description="convert chapters to HTML and Markdown",
+            refresh=False,
         )
+        # Both stages read chapters straight from the extracted tree and only
+        # add their own keys to the shared TOC entries, so they can overlap.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            html_future = executor.submit(
+                convert_to_html, stem, base_dir=base_dir, toc_entries=toc_entries
+            )
+            markdown_future = executor.submit(
+                convert_to_markdown, stem, base_dir=base_dir, toc_entries=toc_entries
+            )
+            for future in as_completed((html_future, markdown_future)):
+                future.result()
+                progress.update(convert_task, advance=1, refresh=False)
+        markdown_paths = markdown_future.result()
+        progress.update(convert_task, description="Finished converting to markdown.")
         logger.info("Completed pipeline for {epub}", epub=epub)
     return markdown_paths
 
@@ -1,9 +1,13 @@
 """Initialize epub2audio.utils subpackage."""
 
 from epub2audio.utils.logging import get_console, get_logger, get_progress
+from epub2audio.utils.toc import chapter_key, numeric_chapters, write_toc
 
 __all__ = [
+    "chapter_key",
     "get_console",
     "get_logger",
     "get_progress",
+    "numeric_chapters",
+    "write_toc",
 ]
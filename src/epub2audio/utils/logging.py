@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -26,8 +27,12 @@ TRACE_FORMAT = "{time:HH:mm:ss.SSS}|{level:^8}| Module:{module} \
 | {function} | Line {line:^5}|{message}"
 
 
+@functools.lru_cache(maxsize=None)
 def get_console(console: Console | None = None) -> Console:
-    """Create a Rich console for app output."""
+    """Create a Rich console for app output.
+
+    Cached, so the Rich traceback hook is installed once per console.
+    """
     if console is None:
         console = rich_get_console()
     tr_install(console=console)
@@ -35,7 +40,14 @@ def get_console(console: Console | None = None) -> Console:
 
 
 def get_progress(console: Console | None = None) -> Progress:
-    """Create a Rich Progress instance using the provided console."""
+    """Create a Rich Progress instance using the provided console.
+
+    Redraws are throttled to a fixed rate so fast loops that call
+    ``progress.advance`` per item are not bound by terminal rendering.
+    Unlike the console and logger this is not cached: each module enters and
+    exits its own ``with progress:`` block, and a shared instance would let an
+    inner stage stop the display of the stage that wraps it.
+    """
     if console is None:
         console = get_console()
     return Progress(
@@ -45,10 +57,13 @@ def get_progress(console: Console | None = None) -> Progress:
         MofNCompleteColumn(),
         TimeRemainingColumn(),
         console=console,
-        transient=True,
+        transient=False,
+        auto_refresh=True,
+        refresh_per_second=5,
     )
 
 
+@functools.lru_cache(maxsize=None)
 def get_logger(
     log_path: Path | str = Path("logs/trace.log"),
     level: str = "DEBUG",
@@ -57,6 +72,9 @@ def get_logger(
 ) -> Logger:
     """Configure Loguru with a file sink and Rich console sink.
 
+    Cached, so the module-level ``logger = get_logger()`` in every module
+    configures the sinks once instead of tearing down and re-adding them.
+
     Args:
         log_path: File path for trace logs.
         level: Console log level.
@@ -0,0 +1,65 @@
+"""Helpers for reading and writing toc.json entries."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable
+
+import orjson
+
+
+def chapter_key(entry: dict[str, Any]) -> int | None:
+    """Return a TOC entry's chapter number as an int, if it has one."""
+    value = entry.get("chapter_number")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def numeric_chapters(toc_entries: Iterable[dict[str, Any]]) -> list[int]:
+    """Return the numeric chapter numbers of entries that have markdown.
+
+    Args:
+        toc_entries: Parsed toc.json entries.
+    Returns:
+        Chapter numbers in TOC order, skipping entries without markdown or
+        without an integer-like ``chapter_number``.
+    """
+    chapters: list[int] = []
+    for entry in toc_entries:
+        if not entry.get("markdown"):
+            continue
+        chapter = chapter_key(entry)
+        if chapter is not None:
+            chapters.append(chapter)
+    return chapters
+
+
+def write_toc(toc_path: Path, toc_entries: list[dict[str, Any]]) -> None:
+    """Atomically write toc.json entries, one JSON object per line.
+
+    Entries are serialized and written one at a time through a buffered
+    handle, so the whole document is never held as a single buffer. Pipeline
+    stages that share one entry list may save it from different threads;
+    writing to a temporary file and renaming it over ``toc_path`` keeps
+    readers (and a concurrent writer) from ever seeing a torn file.
+
+    Args:
+        toc_path: Destination toc.json path.
+        toc_entries: Entries to serialize.
+    """
+    suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp_path = toc_path.with_name(f".{toc_path.name}.{suffix}")
+    with open(tmp_path, "wb", buffering=1 << 16) as handle:
+        handle.write(b"[")
+        separator = b"\n  "
+        for entry in toc_entries:
+            handle.write(separator)
+            handle.write(orjson.dumps(entry))
+            separator = b",\n  "
+        handle.write(b"\n]\n" if toc_entries else b"]\n")
+    os.replace(tmp_path, toc_path)
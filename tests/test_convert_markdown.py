@@ -0,0 +1,47 @@
+"""Regression checks for markdown post-processing."""
+
+import pytest
+
+from epub2audio.reformat.convert_markdown import (
+    _fast_html_to_markdown,
+    _postprocess_markdown,
+    _replace_bold_spans,
+    _replace_rule,
+)
+
+
+def test_page_span_inside_heading_block_keeps_heading() -> None:
+    markdown = (
+        '<div class="class_s5">\n\n<span id="page_7"></span>12\n\n'
+        "# The Ascent\n\n</div>\n\n"
+        "Opening paragraph.\n\n"
+        '<div class="class_sfp">\n<img src="rule.svg" />\n</div>\n\n'
+        "After rule.\n"
+    )
+    result = _postprocess_markdown(markdown, "The Ascent", 12)
+    result = _replace_rule(result)
+    result = _replace_bold_spans(result)
+
+    assert result.startswith("# Chapter 12: The Ascent\n\nOpening paragraph.")
+    assert "After rule." in result
+    assert "page_7" not in result
+
+
+@pytest.mark.parametrize(
+    ("body", "expected"),
+    [
+        ("<p>1. Not a list</p>", "1\\. Not a list"),
+        ("<p>2021) A year</p>", "2021\\) A year"),
+        ("<p># hash</p>", "\\# hash"),
+        ("<p>- dash</p>", "\\- dash"),
+        ("<p>+ plus</p>", "\\+ plus"),
+        ("<p>-dash</p>", "-dash"),
+        ("<p>a<br/># b</p>", "a\\\n\\# b"),
+        ("<p>x<em> spaced</em> y</p>", "x *spaced* y"),
+        ("<p>x <em>trail </em>y</p>", "x *trail* y"),
+        ("<p>x <em> </em> y</p>", "x y"),
+    ],
+)
+def test_fast_path_matches_pandoc_escaping(body: str, expected: str) -> None:
+    html = f"<html><head><title>t</title></head><body>{body}</body></html>"
+    assert _fast_html_to_markdown(html.encode("utf-8")) == expected + "\n"
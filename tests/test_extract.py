@@ -0,0 +1,60 @@
+"""Checks for toc.ncx parsing."""
+
+from pathlib import Path
+
+from epub2audio.reformat.extract import generate_toc
+
+_NCX = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE ncx PUBLIC "-//NISO//DTD ncx 2005-1//EN"
+  "http://www.daisy.org/z3986/2005/ncx-2005-1.dtd">
+<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">
+  <navMap>
+    <navPoint id="p1">
+      <navLabel><text>Part One</text></navLabel>
+      <content src="part1.xhtml"/>
+      <navPoint id="c1">
+        <navLabel><text>1. The Ascent</text></navLabel>
+        <content src="ch1.xhtml"/>
+      </navPoint>
+      <navPoint id="c2">
+        <navLabel><text>2. 1984</text></navLabel>
+        <content src="ch2.xhtml"/>
+      </navPoint>
+    </navPoint>
+    <navPoint id="c3">
+      <navLabel><text>3. Acknowledgments</text></navLabel>
+      <content src="ack.xhtml"/>
+    </navPoint>
+  </navMap>
+  <pageList>
+    <pageTarget id="page1" type="normal" value="1">
+      <navLabel><text>1. Not a chapter</text></navLabel>
+      <content src="ch1.xhtml#page1"/>
+    </pageTarget>
+  </pageList>
+</ncx>
+"""
+
+
+def test_generate_toc_reads_nested_navpoints_in_order(tmp_path: Path) -> None:
+    extracted = tmp_path / "book" / "extracted"
+    (extracted / "OEBPS").mkdir(parents=True)
+    (extracted / "OEBPS" / "toc.ncx").write_text(_NCX, encoding="utf-8")
+
+    toc = generate_toc(extracted)
+
+    assert toc == [
+        {
+            "order": 2,
+            "chapter_number": 1,
+            "chapter_title": "The Ascent",
+            "chapter_path": "ch1.xhtml",
+        },
+        {
+            "order": 3,
+            "chapter_number": 2,
+            "chapter_title": "1984",
+            "chapter_path": "ch2.xhtml",
+        },
+    ]
+    assert (tmp_path / "book" / "json" / "toc.json").is_file()